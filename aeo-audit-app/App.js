@@ -34,7 +34,8 @@ export default function App() {
     }
 
     try {
-      const response = await fetch(apiUrl, {
+      // Streaming endpoint: one NDJSON line per check as soon as it is decided, then a final "score" line
+      const response = await fetch(`${apiUrl}/stream?format=ndjson`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -48,8 +49,35 @@ export default function App() {
         throw new Error('Network response was not ok');
       }
 
-      const data = await response.json();
-      setReport(data);
+      const checks = [];
+      const handleLine = (line) => {
+        if (!line.trim()) return;
+        const event = JSON.parse(line);
+        if (event.type === 'check') {
+          checks[event.index] = event;
+          setReport({ url: url, score: null, results: checks.filter(Boolean) });
+        } else if (event.type === 'score') {
+          setReport(event);
+        }
+      };
+
+      if (response.body && response.body.getReader) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (true) {
+          const { done, value } = await reader.read();
+          if (done) break;
+          buffer += decoder.decode(value, { stream: true });
+          const lines = buffer.split('\n');
+          buffer = lines.pop();
+          lines.forEach(handleLine);
+        }
+        handleLine(buffer);
+      } else {
+        // React Native fetch has no streaming body: same events, delivered at the end
+        (await response.text()).split('\n').forEach(handleLine);
+      }
     } catch (error) {
       console.error(error);
       alert('Failed to analyze. Is the backend on port 8001?');
@@ -155,7 +183,7 @@ export default function App() {
             {/* Score Badge */}
             <View style={[styles.scoreCard, { borderColor: getScoreColor(report.score) }]}>
               <Text style={[styles.scoreLabel, { color: getScoreColor(report.score) }]}>AEO SCORE</Text>
-              <Text style={styles.scoreValue}>{report.score}</Text>
+              <Text style={styles.scoreValue}>{report.score === null ? '…' : report.score}</Text>
             </View>
 
             <Text style={styles.sectionTitle}>10-Point Analysis Results</Text>
@@ -173,12 +201,12 @@ export default function App() {
                 </View>
               ))}
             </View>
-            <ServiceRecommendation results={report.results} url={url} />
+            {report.score !== null && <ServiceRecommendation results={report.results} url={url} />}
           </View>
         )}
 
         {/* Export Button */}
-        {report && Platform.OS === 'web' && (
+        {report && report.score !== null && Platform.OS === 'web' && (
           <TouchableOpacity style={styles.exportButton} onPress={exportReport}>
             <Text style={styles.exportButtonText}>Download Report as PDF</Text>
           </TouchableOpacity>
@@ -279,6 +307,7 @@ function ContactButton({ url, subject }) {
 }
 
 function getScoreColor(score) {
+  if (score === null) return '#888888'; // Still streaming
   if (score >= 80) return '#4CD964'; // Green
   if (score >= 50) return '#FFCC00'; // Yellow
   return '#FF3B30'; // Red
@@ -0,0 +1,43 @@
+"""
+AEO (Answer Engine Optimization) audits, shared by the API (aeo_api.py), the Vercel
+function (api/index.py) and the CLI (`python -m aeo`).
+
+Importing the package is cheap: submodules, and the heavy dependencies behind them
+(httpx, lxml / selectolax, multiprocessing, Playwright), load on first use.
+"""
+import importlib
+
+# Public name -> submodule it lives in
+_EXPORTS = {
+    "analyze_aeo": "analyzer",
+    "analyze_aeo_async": "analyzer",
+    "analyze_many": "analyzer",
+    "iter_audit": "analyzer",
+    "crawl_site": "crawl",
+    "HttpPool": "http",
+    "get_pool": "http",
+    "close_pool": "http",
+    "RULES": "rules",
+    "RuleEngine": "rules",
+    "AuditContext": "rules",
+    "catalog": "catalog",
+    "compact_result": "catalog",
+    "expand_result": "catalog",
+    "get_plan": "profiles",
+    "ProfileError": "profiles",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'aeo' has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value   # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,412 @@
+import asyncio
+import time
+from urllib.parse import urlparse, urljoin
+from .cache import ResultCache, cache_from_env, result_cache_from_env
+from .fetch import MAX_BODY_BYTES, stream_html
+from .fingerprint import Fingerprinter
+from .history import record_history
+from .http import HttpPool, get_pool, normalize_url
+from .metrics import RESPONSES, RequestTrace, record_audit
+from .offload import evaluate, get_executor
+from .profiles import get_plan
+from .render import ShellProbe, get_render_pool
+from .robots import RobotsPolicy, fetch_robots
+from .rules import AuditContext, RuleEngine
+
+# robots.txt policies / sitemap statuses per origin, shared by every audit in this process
+origin_cache = cache_from_env()
+
+# Finished audits per page, revalidated with ETag / Last-Modified / body hash
+result_cache = result_cache_from_env()
+
+# Max audits in flight for analyze_many (each audit makes 3 requests)
+DEFAULT_CONCURRENCY = 50
+
+# Sitemap URLs from robots.txt we probe before giving up on them
+MAX_LISTED_SITEMAPS = 3
+
+
+async def _fetch_status(client, url, timeout, resource):
+    """
+    GET a secondary resource (robots.txt, sitemap.xml) and return its status code.
+    Only the headers are read: the response is closed before its body (a sitemap can be 50 MB).
+    Returns None when the request itself failed (DNS, timeout, TLS...).
+    """
+    try:
+        async with client.stream("GET", url, timeout=timeout) as response:
+            RESPONSES.inc(resource=resource, status=response.status_code)
+            return response.status_code
+    except Exception:
+        RESPONSES.inc(resource=resource, status="error")
+        return None
+
+
+async def _cached_status(client, url, timeout, resource):
+    """
+    Status code for a per-origin resource, served from origin_cache when possible.
+    Failures are cached too (for a shorter time) so a dead origin is not retried per page.
+    """
+    async def fetch():
+        return {"status": await _fetch_status(client, url, timeout, resource)}
+
+    entry = await origin_cache.get_or_fetch(url, fetch, lambda e: e["status"] == 200)
+    return entry["status"]
+
+
+async def _cached_robots(client, base_domain):
+    """
+    robots.txt of an origin, fetched once and kept parsed in origin_cache.
+    Returns (status, RobotsPolicy or None, seconds).
+    """
+    robots_url = urljoin(base_domain, "/robots.txt")
+
+    async def fetch():
+        return await fetch_robots(client, robots_url, 5)
+
+    started = time.perf_counter()
+    entry = await origin_cache.get_or_fetch(robots_url, fetch, lambda e: e["status"] == 200)
+    policy = RobotsPolicy.from_dict(entry["policy"]) if entry.get("policy") else None
+    return entry["status"], policy, time.perf_counter() - started
+
+
+async def load_robots(client, base_domain):
+    """
+    The origin's RobotsPolicy (empty when there is no robots.txt), from the shared cache.
+    """
+    _, policy, _ = await _cached_robots(client, base_domain)
+    return policy or RobotsPolicy()
+
+
+async def _find_sitemap(client, base_domain, robots):
+    """
+    Sitemap discovery: the Sitemap: lines of robots.txt first, then /sitemap.xml.
+    `robots` is the (shared) _cached_robots task. Returns (status, sitemap url, source, seconds);
+    status is the last one seen when nothing answered 200.
+    """
+    started = time.perf_counter()
+    _, policy, _ = await robots
+    root = urljoin(base_domain, "/sitemap.xml")
+    candidates = [(urljoin(base_domain, loc), "robots") for loc in (policy.sitemaps if policy else [])]
+    candidates = candidates[:MAX_LISTED_SITEMAPS]
+    if root not in [loc for loc, _ in candidates]:
+        candidates.append((root, "root"))
+    status = None
+    for loc, source in candidates:
+        status = await _cached_status(client, loc, 5, "sitemap")
+        if status == 200:
+            return status, loc, source, time.perf_counter() - started
+    return status, None, None, time.perf_counter() - started
+
+
+def analyze_aeo(url):
+    """
+    Analyze a given URL for Answer Engine Optimization (AEO) readiness.
+    Evaluates 10 criteria, each worth 10 points. Total 100 points.
+
+    Blocking wrapper around analyze_aeo_async for scripts and sync callers.
+    Do not call this from inside a running event loop - await analyze_aeo_async instead.
+    """
+    async def run():
+        async with HttpPool() as client:
+            return await analyze_aeo_async(url, client)
+
+    return asyncio.run(run())
+
+
+async def analyze_many(urls, concurrency=DEFAULT_CONCURRENCY, client=None):
+    """
+    Audit many URLs concurrently, with at most `concurrency` audits in flight.
+    Results are returned in the same order as `urls`.
+    """
+    if client is None:
+        client = get_pool()
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(url):
+        async with semaphore:
+            return await analyze_aeo_async(url, client)
+
+    return await asyncio.gather(*(run(url) for url in urls))
+
+
+def _cached_outcomes(engine, cached_result):
+    """
+    (outcomes, elapsed, details) for RuleEngine.apply from a cached result's HTML checks,
+    or None when the cache does not cover every HTML check of this audit.
+    """
+    items = {item.get("id"): item for item in cached_result["results"]}
+    outcomes = {}
+    details = {}
+    for rule in engine.rules:
+        if rule.scope == "page":
+            continue
+        item = items.get(rule.id)
+        if item is None:
+            return None
+        outcomes[rule.id] = (item["status"], item["icon"], item["desc"])
+        if item.get("details") is not None:
+            details[rule.id] = item["details"]
+    return outcomes, {}, details
+
+
+def _result_key(url, plan, rules):
+    key = normalize_url(url) + "#" + plan.name
+    if rules is not None:
+        key += "#" + ",".join(sorted(rule.id for rule in rules))
+    return key
+
+
+async def analyze_aeo_async(url, client=None, rules=None, max_bytes=MAX_BODY_BYTES, on_result=None, use_cache=True,
+                            profile=None, baseline=None, fingerprint=False):
+    """
+    Async AEO audit. The main page and robots.txt are fetched at the same time, so a slow
+    origin costs max(timeouts) instead of the sum; the sitemap is looked up at the locations
+    robots.txt lists (then /sitemap.xml) while the page is still downloading.
+    `client` is an aeo.http.HttpPool; defaults to the process-wide pool.
+    `profile` names a scoring profile (see aeo.profiles / profiles.json): check weights,
+    thresholds and disabled checks. Disabled robots/sitemap checks skip their fetch.
+    `rules` limits the audit further to some aeo.rules.RULES; the download stops as soon as all
+    of them are decided (e.g. head-only checks stop once their tags are found).
+    Raises aeo.profiles.ProfileError for an unknown profile.
+    Pages larger than `max_bytes` are checked on their first `max_bytes` and flagged as truncated.
+    `on_result(index, item)` is called as soon as each check is decided (see iter_audit).
+    Phase timings (ms) go to result["timings"] and every audit is recorded in aeo.metrics
+    and, once the API has started it, appended to aeo.history.
+    With AEO_PARSE_WORKERS set, parsing and the HTML checks of big pages run in a process pool
+    (see aeo.offload) so they do not block the event loop.
+
+    Results are kept in result_cache. A repeat audit sends a conditional GET and reuses the
+    cached HTML checks on a 304 or when the body hash is unchanged ("cache": "not_modified" /
+    "unchanged"); robots.txt and the sitemap are still checked fresh. `use_cache=False` skips the lookup but still stores the fresh result.
+    `baseline` is an entry in the same layout (etag, last_modified, body_hash, result) to
+    revalidate against instead, e.g. a stored snapshot (see aeo_snapshots).
+    `fingerprint=True` reads the whole page and adds result["fingerprints"] (aeo.fingerprint).
+
+    A page that looks like a client-rendered shell (aeo.render.ShellProbe) gets result["render"].
+    With a renderer configured (AEO_RENDERER), only those pages are rendered and their HTML checks
+    run again on the rendered page; streaming audits (on_result) report the raw page.
+    """
+    
+    # Prepend http if missing
+    if not url.startswith("http"):
+        url = "https://" + url
+
+    if client is None:
+        client = get_pool()
+
+    plan = get_plan(profile)
+    if rules is not None:
+        wanted = {rule.id for rule in rules}
+        rules = [rule for rule in plan.rules if rule.id in wanted]
+
+    audit_started = time.perf_counter()
+    parsed_url = urlparse(url)
+    base_domain = f"{parsed_url.scheme}://{parsed_url.netloc}"
+
+    # Kick off the page and robots.txt fetches at once (robots usually comes from the cache).
+    # The sitemap check reads the Sitemap: lines of that same robots.txt before probing.
+    # A check the profile (or `rules`) leaves out does not get its fetch.
+    rule_ids = {rule.id for rule in (rules if rules is not None else plan.rules)}
+    side = {}
+    if "robots" in rule_ids or "sitemap" in rule_ids:
+        robots = asyncio.ensure_future(_cached_robots(client, base_domain))
+        if "robots" in rule_ids:
+            side["robots"] = robots
+        if "sitemap" in rule_ids:
+            side["sitemap"] = asyncio.ensure_future(_find_sitemap(client, base_domain, robots))
+
+    cache_key = _result_key(url, plan, rules)
+    cached = baseline if baseline is not None else result_cache.get(cache_key) if use_cache else None
+    if use_cache and baseline is None:
+        if cached:
+            result_cache.hits += 1
+        else:
+            result_cache.misses += 1
+
+    try:
+        ctx = AuditContext(url, base_domain)
+        fingerprinter = Fingerprinter() if fingerprint else None
+        probe = ShellProbe()
+        engine = RuleEngine(ctx, rules if rules is not None else plan.rules, on_result=on_result,
+                            weights=plan.weights, observer=[probe] + ([fingerprinter] if fingerprinter else []))
+        parse_seconds = 0.0
+        trace = RequestTrace()
+        reused = None
+
+        # With a parse pool, batch audits download the raw bytes and parse them in another process.
+        # Streaming consumers (on_result) keep the in-loop parser so head checks still arrive early.
+        offload = on_result is None and get_executor() is not None
+
+        if cached or offload:
+            # Hold the body: its hash decides whether it needs parsing at all
+            chunks = []
+            fetch = await stream_html(client, url, None, max_bytes=max_bytes, trace=trace, on_bytes=chunks.append,
+                                      headers=ResultCache.conditional_headers(cached))
+            fetch_main = time.perf_counter() - audit_started
+            unchanged = cached and (fetch["status"] == 304 or fetch["body_hash"] == cached["body_hash"])
+            # A cached audit without fingerprints cannot stand in for one that wants them
+            if unchanged and fingerprint and cached["result"].get("fingerprints") is None:
+                unchanged = False
+            reusable = _cached_outcomes(engine, cached["result"]) if unchanged else None
+            if reusable is None and fetch["status"] == 304:
+                # Not modified, but the entry lacks checks this audit runs (a check enabled since,
+                # no fingerprints...): a 304 has no body to parse, so fetch the page itself
+                chunks = []
+                fetch = await stream_html(client, url, None, max_bytes=max_bytes, trace=trace, on_bytes=chunks.append)
+                fetch_main = time.perf_counter() - audit_started
+            if reusable is not None:
+                # Same page: checks 1-8 come from the cache without parsing. robots.txt and the
+                # sitemap change on their own, so checks 9-10 are still settled fresh below.
+                del chunks
+                reused = "not_modified" if fetch["status"] == 304 else "unchanged"
+                engine.apply(*reusable)
+                fingerprints = cached["result"].get("fingerprints")
+                shell = None
+            else:
+                evaluated = await evaluate(b"".join(chunks), fetch["encoding"], url, base_domain,
+                                           tuple(rule.id for rule in engine.rules), plan.name, fingerprint, probe=True)
+                del chunks
+                engine.apply(evaluated["outcomes"], evaluated["elapsed"], evaluated["details"])
+                fetch["encoding"] = evaluated["encoding"]
+                fetch["decoded_chars"] = evaluated["decoded_chars"]
+                parse_seconds = evaluated["parse"]
+                fingerprints = evaluated["fingerprints"]
+                shell = evaluated["shell"]
+        else:
+            # Fetch Main Page, streamed straight into the rule engine (no full body in memory).
+            # Checks 1-8 run in one pass over the HTML as it arrives.
+            def on_text(text):
+                nonlocal parse_seconds
+                started = time.perf_counter()
+                engine.feed(text)
+                parse_seconds += time.perf_counter() - started
+
+            # Fingerprints need the whole page, so no early stop then
+            should_stop = None if fingerprint else lambda: engine.done
+            fetch = await stream_html(client, url, on_text, max_bytes=max_bytes, should_stop=should_stop, trace=trace)
+            fetch_main = time.perf_counter() - audit_started
+            started = time.perf_counter()
+            engine.close()
+            engine.settle_html()
+            parse_seconds += time.perf_counter() - started
+            fingerprints = fingerprinter.fingerprints() if fingerprinter else None
+            shell = probe.verdict()
+
+        # Client-rendered shell: the raw HTML has next to nothing to check. Only these pages go
+        # to the render stage (when one is configured), so the expensive step stays rare.
+        # A download the rules cut short did not show the probe the whole page.
+        render = cached["result"].get("render") if reused else None
+        render_seconds = None
+        if shell is not None and shell["shell"] and not fetch["stopped_early"]:
+            render = dict(shell, rendered=False)
+            try:
+                pool = get_render_pool()
+            except ValueError as e:
+                # Misconfigured renderer (normally caught at startup): report it, keep the raw checks
+                pool = None
+                render["error"] = str(e)
+            if pool is not None and on_result is None:
+                started = time.perf_counter()
+                try:
+                    html = await pool.render(url)
+                    evaluated = await evaluate(html.encode("utf-8"), "utf-8", url, base_domain,
+                                               tuple(rule.id for rule in engine.rules), plan.name, fingerprint)
+                    # Fresh engine for the rendered page; page-scope checks are settled on it below
+                    engine = RuleEngine(ctx, rules if rules is not None else plan.rules, weights=plan.weights)
+                    engine.apply(evaluated["outcomes"], evaluated["elapsed"], evaluated["details"])
+                    if fingerprint:
+                        fingerprints = evaluated["fingerprints"]
+                    render["rendered"] = True
+                    render["rendered_chars"] = evaluated["decoded_chars"]
+                except Exception as e:
+                    # Keep the raw page's checks
+                    render["error"] = str(e) or type(e).__name__
+                render_seconds = time.perf_counter() - started
+
+        # Checks 9-10 read the robots policy and sitemap lookup; settle each as soon as it is back
+        side_seconds = {}
+        pending = set(side.values())
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for name, task in side.items():
+                if task in done:
+                    if name == "robots":
+                        ctx.robots_status, ctx.robots, side_seconds[name] = task.result()
+                    else:
+                        ctx.sitemap_status, ctx.sitemap_url, ctx.sitemap_source, side_seconds[name] = task.result()
+                    engine.settle_page(name)
+
+        score, results, rule_timings = engine.results()
+        result = {
+            "score": score,
+            "url": url,
+            "profile": plan.name,
+            "results": results,
+            "truncated": cached["result"].get("truncated", False) if reused else fetch["truncated"],
+            "fetch": fetch,
+            "timings": {
+                "parser": engine.parser.name,
+                "total": round((time.perf_counter() - audit_started) * 1000, 3),
+                "fetch_main": round(fetch_main * 1000, 3),
+                "fetch_robots": round(side_seconds["robots"] * 1000, 3) if "robots" in side_seconds else None,
+                "fetch_sitemap": round(side_seconds["sitemap"] * 1000, 3) if "sitemap" in side_seconds else None,
+                "http": trace.ms(),
+                # parse includes the checks, which run inside the parser callbacks
+                "parse": round(parse_seconds * 1000, 3),
+                "render": round(render_seconds * 1000, 3) if render_seconds is not None else None,
+                "rules": rule_timings,
+            },
+            "cache": reused or ("miss" if use_cache else "bypass"),
+        }
+        if fingerprint:
+            result["fingerprints"] = fingerprints
+        if render is not None:
+            result["render"] = render
+        record_audit(result, time.perf_counter() - audit_started)
+        record_history(result)
+        if reused:
+            # The stored validators and hash still describe the page (a 304 carries no body)
+            validators = {"etag": fetch.get("etag") or cached["etag"],
+                          "last_modified": fetch.get("last_modified") or cached["last_modified"],
+                          "body_hash": cached["body_hash"]}
+            result_cache.put(cache_key, validators, result)
+        else:
+            # A download cut short by the rules hashed only part of the body: keep the validators only
+            result_cache.put(cache_key, dict(fetch, body_hash=None) if fetch["stopped_early"] else fetch, result)
+        return result
+
+    except Exception as e:
+        for task in side.values():
+            task.cancel()
+        result = {
+            "score": 0,
+            "url": url,
+            "error": str(e),
+            "results": [{"title": "Analysis Failed", "status": "Fail", "icon": "❌", "desc": str(e)}]
+        }
+        record_audit(result, time.perf_counter() - audit_started)
+        return result
+
+async def iter_audit(url, client=None, rules=None, max_bytes=MAX_BODY_BYTES, use_cache=True, profile=None):
+    """
+    Streaming audit. Yields {"type": "check", "index": i, ...} for each check the moment it is
+    decided (passing head checks before the body has even downloaded), then one final
+    {"type": "score", ...} event carrying the full analyze_aeo result.
+    """
+    queue = asyncio.Queue()
+
+    def on_result(index, item):
+        queue.put_nowait({"type": "check", "index": index, **item})
+
+    task = asyncio.ensure_future(analyze_aeo_async(url, client, rules, max_bytes, on_result, use_cache, profile))
+    task.add_done_callback(lambda _: queue.put_nowait(None))
+    try:
+        while True:
+            event = await queue.get()
+            if event is None:
+                break
+            yield event
+        yield {"type": "score", **task.result()}
+    finally:
+        task.cancel()
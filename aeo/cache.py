@@ -0,0 +1,230 @@
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+
+# Successful lookups (200) are kept for an hour, failures (404, timeout...) for 5 minutes
+DEFAULT_TTL = 3600
+DEFAULT_NEGATIVE_TTL = 300
+DEFAULT_MAX_ENTRIES = 2048
+
+# Full audit results, keyed by page URL: revalidated after a day at most
+RESULT_TTL = 86400
+RESULT_MAX_ENTRIES = 1000
+RESULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class MemoryBackend:
+    """
+    In-process LRU with a per-entry expiry time.
+    Each uvicorn worker gets its own copy.
+    """
+    name = "memory"
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    async def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key, value, ttl):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisBackend:
+    """
+    Shared backend so several uvicorn workers (or Vercel instances) reuse each other's hits.
+    Needs the optional `redis` package. Redis handles expiry and eviction (set maxmemory-policy).
+    """
+    name = "redis"
+
+    def __init__(self, url, prefix="aeo:origin:"):
+        import redis.asyncio as redis
+        self._redis = redis.from_url(url)
+        self.prefix = prefix
+
+    async def get(self, key):
+        raw = await self._redis.get(self.prefix + key)
+        if raw is None:
+            return None
+        return json.loads(raw)
+
+    async def set(self, key, value, ttl):
+        await self._redis.set(self.prefix + key, json.dumps(value), ex=int(ttl))
+
+    def __len__(self):
+        # Size lives in Redis; not worth a round trip for stats
+        return -1
+
+
+class OriginCache:
+    """
+    Origin-keyed cache for per-site lookups (robots.txt, sitemap.xml).
+    Positive results use `ttl`, failures use the shorter `negative_ttl`.
+    Concurrent misses for the same key share one fetch.
+    """
+
+    def __init__(self, backend=None, ttl=DEFAULT_TTL, negative_ttl=DEFAULT_NEGATIVE_TTL):
+        self.backend = backend or MemoryBackend()
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self._inflight = {}
+
+    async def get_or_fetch(self, key, fetch, is_positive):
+        """
+        Return the cached value for `key`, or await `fetch()` and cache its result.
+        `is_positive(value)` picks between the normal and the negative TTL.
+        """
+        value = await self.backend.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.hits += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future = asyncio.ensure_future(fetch())
+        self._inflight[key] = future
+        try:
+            value = await asyncio.shield(future)
+        finally:
+            self._inflight.pop(key, None)
+        ttl = self.ttl if is_positive(value) else self.negative_ttl
+        await self.backend.set(key, value, ttl)
+        return value
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "backend": self.backend.name,
+            "entries": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+class ResultCache:
+    """
+    In-process cache of finished audits, keyed by normalized URL.
+    Each entry keeps the page's validators (ETag / Last-Modified) and body hash, so the next
+    audit can send a conditional GET and reuse the checks on a 304 or an identical body.
+    Bounded by entry count and by the (JSON) size of the stored results, LRU first.
+    """
+
+    def __init__(self, max_entries=RESULT_MAX_ENTRIES, max_bytes=RESULT_MAX_BYTES, ttl=RESULT_TTL):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry["stored"] + self.ttl < time.monotonic():
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, fetch, result):
+        """
+        Store `result` with the validators from the `fetch` info of the audit that produced it.
+        Pages that cannot be revalidated (no validators, no hash) are not stored.
+        """
+        if not (fetch.get("etag") or fetch.get("last_modified") or fetch.get("body_hash")):
+            return
+        size = len(json.dumps(result, ensure_ascii=False))
+        if size > self.max_bytes:
+            return
+        self._drop(key)
+        self._entries[key] = {
+            "etag": fetch.get("etag"),
+            "last_modified": fetch.get("last_modified"),
+            "body_hash": fetch.get("body_hash"),
+            "result": result,
+            "size": size,
+            "stored": time.monotonic(),
+        }
+        self.bytes += size
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry["size"]
+
+    @staticmethod
+    def conditional_headers(entry):
+        headers = {}
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+def result_cache_from_env():
+    """
+    Build the result cache from AEO_RESULT_CACHE_TTL, AEO_RESULT_CACHE_MAX_ENTRIES
+    and AEO_RESULT_CACHE_MAX_BYTES.
+    """
+    return ResultCache(
+        max_entries=int(os.environ.get("AEO_RESULT_CACHE_MAX_ENTRIES", RESULT_MAX_ENTRIES)),
+        max_bytes=int(os.environ.get("AEO_RESULT_CACHE_MAX_BYTES", RESULT_MAX_BYTES)),
+        ttl=int(os.environ.get("AEO_RESULT_CACHE_TTL", RESULT_TTL)),
+    )
+
+
+def cache_from_env():
+    """
+    Build the origin cache from environment variables:
+    AEO_CACHE_URL (e.g. redis://localhost:6379/0, default in-process memory),
+    AEO_CACHE_TTL, AEO_CACHE_NEGATIVE_TTL, AEO_CACHE_MAX_ENTRIES.
+    """
+    url = os.environ.get("AEO_CACHE_URL")
+    if url and url.startswith(("redis://", "rediss://")):
+        backend = RedisBackend(url)
+    else:
+        backend = MemoryBackend(int(os.environ.get("AEO_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)))
+    return OriginCache(
+        backend,
+        ttl=int(os.environ.get("AEO_CACHE_TTL", DEFAULT_TTL)),
+        negative_ttl=int(os.environ.get("AEO_CACHE_NEGATIVE_TTL", DEFAULT_NEGATIVE_TTL)),
+    )
@@ -0,0 +1,108 @@
+import hashlib
+import json
+from functools import lru_cache
+
+from .rules import RULES
+
+# Bump when the compact layout or the meaning of the codes changes
+SCHEMA_VERSION = 1
+
+
+def _outcomes(rule_class):
+    # Outcomes are the (status, icon, desc) class constants, in definition order (PASS first)
+    return [(name.lower(), value) for name, value in vars(rule_class).items()
+            if name.isupper() and isinstance(value, tuple) and len(value) == 3]
+
+
+@lru_cache(maxsize=None)
+def catalog():
+    """
+    Static description of every check and its possible outcomes. Clients fetch it once
+    (GET /checks) and resolve compact results against it.
+    """
+    checks = []
+    for rule_class in RULES:
+        checks.append({
+            "id": rule_class.id,
+            "title": rule_class.title,
+            "outcomes": [{"code": code, "status": status, "icon": icon, "desc": desc}
+                         for code, (status, icon, desc) in _outcomes(rule_class)],
+        })
+    return {"v": SCHEMA_VERSION, "checks": checks}
+
+
+@lru_cache(maxsize=None)
+def catalog_etag():
+    body = json.dumps(catalog(), ensure_ascii=False, sort_keys=True).encode()
+    return '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+
+@lru_cache(maxsize=None)
+def _tables():
+    positions = {}
+    codes = {}
+    for position, check in enumerate(catalog()["checks"]):
+        positions[check["id"]] = position
+        for code, outcome in enumerate(check["outcomes"]):
+            codes[(check["id"], outcome["status"], outcome["icon"], outcome["desc"])] = code
+    return positions, codes
+
+
+def compact_result(result):
+    """
+    analyze_aeo result -> compact form:
+    {"v", "url", "score", "pass": bitmask by catalog position, "codes": [outcome index or None]}.
+    Checks that were not run are None. Failed audits keep only their error.
+    """
+    compact = {"v": SCHEMA_VERSION, "url": result["url"], "score": result["score"]}
+    if "error" in result:
+        compact["error"] = result["error"]
+        return compact
+    positions, code_of = _tables()
+    codes = [None] * len(positions)
+    passed = 0
+    for item in result["results"]:
+        position = positions[item["id"]]
+        codes[position] = code_of[(item["id"], item["status"], item["icon"], item["desc"])]
+        if item["status"] == "Pass":
+            passed |= 1 << position
+    compact["pass"] = passed
+    compact["codes"] = codes
+    if result.get("truncated"):
+        compact["truncated"] = True
+    return compact
+
+
+def expand_result(compact):
+    """
+    Compact form -> the verbose analyze_aeo layout (without fetch details and timings).
+    """
+    if "error" in compact:
+        return {
+            "score": compact["score"],
+            "url": compact["url"],
+            "error": compact["error"],
+            "results": [{"title": "Analysis Failed", "status": "Fail", "icon": "❌", "desc": compact["error"]}]
+        }
+    results = []
+    for check, code in zip(catalog()["checks"], compact["codes"]):
+        if code is None:
+            continue
+        outcome = check["outcomes"][code]
+        results.append({"id": check["id"], "title": check["title"], "status": outcome["status"],
+                        "icon": outcome["icon"], "desc": outcome["desc"]})
+    return {"score": compact["score"], "url": compact["url"], "results": results,
+            "truncated": compact.get("truncated", False)}
+
+
+def compact_event(event):
+    """
+    Compact form of an iter_audit / crawl_site event.
+    """
+    if event["type"] == "check":
+        positions, code_of = _tables()
+        return {"type": "check", "index": event["index"], "id": event["id"],
+                "code": code_of[(event["id"], event["status"], event["icon"], event["desc"])]}
+    if event["type"] in ("score", "page"):
+        return {"type": event["type"], **compact_result(event)}
+    return event
@@ -0,0 +1,304 @@
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+import time
+
+from .analyzer import analyze_aeo_async
+from .catalog import compact_result
+from .http import MAX_CONNECTIONS, HttpPool
+from .profiles import DEFAULT_PROFILE, ProfileError, get_plan
+
+DEFAULT_CONCURRENCY = 50
+# URLs read ahead of the oldest unwritten one, per concurrent audit. Results are written in
+# input order, so one slow page holds back at most this many finished ones in memory.
+WINDOW_PER_WORKER = 20
+# Seconds between checkpoints and between stats lines
+CHECKPOINT_EVERY = 2.0
+STATS_EVERY = 1.0
+
+
+def read_urls(path, start_offset=0, start_index=0):
+    """
+    Stream (index, url, end_offset) from a CSV (the "url" column, else the first one),
+    NDJSON ({"url": ...} per line) or plain text file (one URL per line), starting at
+    byte `start_offset`. Blank lines and "#" comments are skipped.
+    The file is read in binary so byte offsets stay exact for resuming.
+    """
+    kind = "ndjson" if path.endswith((".ndjson", ".jsonl")) else "csv" if path.endswith(".csv") else "text"
+    column = 0
+    with open(path, "rb") as f:
+        if kind == "csv":
+            # The header decides the column, also when resuming past it
+            header = f.readline()
+            cells = next(csv.reader([header.decode("utf-8-sig")]), [])
+            names = [cell.strip().lower() for cell in cells]
+            if "url" in names:
+                column = names.index("url")
+            else:
+                f.seek(0)
+        if start_offset:
+            f.seek(start_offset)
+        offset = f.tell()
+        index = start_index
+        for raw in f:
+            offset += len(raw)
+            line = raw.decode("utf-8-sig", "replace").strip()
+            if not line or line.startswith("#"):
+                continue
+            if kind == "ndjson":
+                try:
+                    url = json.loads(line).get("url")
+                except (ValueError, AttributeError):
+                    url = None
+            elif kind == "csv":
+                cells = next(csv.reader([line]), [])
+                url = cells[column].strip() if len(cells) > column else None
+            else:
+                url = line
+            # A bad row still gets a line in the output, so indexes stay aligned with the input
+            yield index, url or "", offset
+            index += 1
+
+
+class Checkpoint:
+    """
+    Progress of a bulk run, next to the output file: how many results are written,
+    where the next input row starts and how long the output is at that point.
+    Output is written in input order, so those three numbers are the whole state.
+    """
+
+    def __init__(self, path, input_path):
+        self.path = path
+        self.input_path = os.path.abspath(input_path)
+        self.next_index = 0
+        self.input_offset = 0
+        self.output_offset = 0
+        self.stats = {}
+
+    def load(self):
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data["input"] != self.input_path:
+            raise SystemExit(f"❌ {self.path} belongs to {data['input']}; use --fresh to start over.")
+        self.next_index = data["next_index"]
+        self.input_offset = data["input_offset"]
+        self.output_offset = data["output_offset"]
+        self.stats = data.get("stats", {})
+        return self
+
+    def save(self, complete=False):
+        data = {
+            "input": self.input_path,
+            "next_index": self.next_index,
+            "input_offset": self.input_offset,
+            "output_offset": self.output_offset,
+            "stats": self.stats,
+            "complete": complete,
+            "saved": time.time(),
+        }
+        # Write then rename: a crash mid-save leaves the previous checkpoint intact
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+
+class BulkStats:
+    """
+    Live counters for the stderr status line.
+    """
+
+    def __init__(self, previous=None):
+        previous = previous or {}
+        self.done = previous.get("done", 0)
+        self.errors = previous.get("errors", 0)
+        self.score_total = previous.get("score_total", 0)
+        self.started = time.monotonic()
+        self.session_done = 0
+        self.inflight = 0
+        self._last = (self.started, 0)
+        self.rate = 0.0
+
+    def add(self, score):
+        # score is None for a failed audit
+        self.done += 1
+        self.session_done += 1
+        if score is None:
+            self.errors += 1
+        else:
+            self.score_total += score
+
+    def line(self):
+        now = time.monotonic()
+        last_time, last_done = self._last
+        if now > last_time:
+            current = (self.session_done - last_done) / (now - last_time)
+            self.rate = current if not self.rate else 0.7 * self.rate + 0.3 * current
+        self._last = (now, self.session_done)
+        elapsed = now - self.started
+        ok = self.done - self.errors
+        avg = self.score_total / ok if ok else 0
+        return (f"⏱️ {elapsed:7.0f}s  done {self.done:,}  errors {self.errors:,} ({self.errors / max(self.done, 1):.1%})  "
+                f"{self.rate:6.1f} url/s (avg {self.session_done / max(elapsed, 1e-9):.1f})  "
+                f"in flight {self.inflight}  avg score {avg:.1f}")
+
+    def to_dict(self):
+        return {"done": self.done, "errors": self.errors, "score_total": self.score_total}
+
+
+async def bulk(input_path, out_path, concurrency=DEFAULT_CONCURRENCY, profile=None, compact=False, fresh=False,
+               checkpoint_path=None, stats_stream=sys.stderr):
+    """
+    Audit every URL in `input_path` with `concurrency` audits in flight and append one
+    NDJSON line per URL to `out_path`, in input order. Progress is checkpointed so an
+    interrupted run picks up where it stopped: the output is cut back to the last
+    checkpoint and the input is read from the row after it.
+    """
+    checkpoint = Checkpoint(checkpoint_path or out_path + ".checkpoint", input_path)
+    if not fresh and os.path.exists(checkpoint.path):
+        checkpoint.load()
+        print(f"↩️ Resuming at row {checkpoint.next_index:,}", file=stats_stream)
+    elif not fresh and os.path.exists(out_path) and os.path.getsize(out_path):
+        raise SystemExit(f"❌ {out_path} exists without a checkpoint; use --fresh to overwrite it.")
+    out = open(out_path, "r+b" if checkpoint.output_offset else "wb")
+    # Anything past the checkpoint was written after it and is audited again
+    out.truncate(checkpoint.output_offset)
+    out.seek(checkpoint.output_offset)
+
+    stats = BulkStats(checkpoint.stats)
+    window = asyncio.Semaphore(concurrency * WINDOW_PER_WORKER)
+    queue = asyncio.Queue(concurrency * 2)
+    finished = {}   # index -> (line bytes, end offset in the input, score or None)
+    next_index = checkpoint.next_index
+    tty = stats_stream.isatty()
+    last_stats = last_save = time.monotonic()
+
+    def write_ready():
+        nonlocal next_index, last_save
+        while next_index in finished:
+            line, input_offset, score = finished.pop(next_index)
+            out.write(line)
+            # Counted once written, so the checkpointed stats match the checkpointed output
+            stats.add(score)
+            next_index += 1
+            checkpoint.next_index = next_index
+            checkpoint.input_offset = input_offset
+            window.release()
+        if time.monotonic() - last_save >= CHECKPOINT_EVERY:
+            save()
+            last_save = time.monotonic()
+
+    def save(complete=False):
+        out.flush()
+        os.fsync(out.fileno())
+        checkpoint.output_offset = out.tell()
+        checkpoint.stats = stats.to_dict()
+        checkpoint.save(complete)
+
+    def show(final=False):
+        nonlocal last_stats
+        now = time.monotonic()
+        if final or now - last_stats >= STATS_EVERY:
+            last_stats = now
+            if tty:
+                print("\r" + stats.line(), end="\n" if final else "", file=stats_stream, flush=True)
+            elif final or int(now - stats.started) % 10 == 0:
+                print(stats.line(), file=stats_stream, flush=True)
+
+    async def reader():
+        for item in read_urls(input_path, checkpoint.input_offset, checkpoint.next_index):
+            await window.acquire()
+            await queue.put(item)
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    async def worker(client):
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            index, url, input_offset = item
+            stats.inflight += 1
+            try:
+                if url:
+                    result = await analyze_aeo_async(url, client, use_cache=False, profile=profile)
+                else:
+                    result = {"score": 0, "url": url, "error": "No URL in this row", "results": []}
+            except Exception as e:
+                result = {"score": 0, "url": url, "error": str(e), "results": []}
+            finally:
+                stats.inflight -= 1
+            score = None if "error" in result else result["score"]
+            if compact:
+                result = compact_result(result)
+            result = dict(result, row=index)
+            finished[index] = ((json.dumps(result, ensure_ascii=False) + "\n").encode("utf-8"), input_offset, score)
+            write_ready()
+            show()
+
+    complete = False
+    try:
+        async with HttpPool(max_connections=max(MAX_CONNECTIONS, concurrency)) as client:
+            tasks = [asyncio.ensure_future(reader())]
+            tasks += [asyncio.ensure_future(worker(client)) for _ in range(concurrency)]
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+        complete = True
+    finally:
+        save(complete)
+        out.close()
+        show(final=True)
+    print(f"✅ {stats.done:,} URLs audited, {stats.errors:,} errors -> {out_path}", file=stats_stream)
+    return stats
+
+
+async def _audit(urls, profile):
+    async with HttpPool() as client:
+        for url in urls:
+            result = await analyze_aeo_async(url, client, profile=profile)
+            print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m aeo", description="AEO audits from the command line.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    audit = commands.add_parser("audit", help="Audit a few URLs and print the results.")
+    audit.add_argument("urls", nargs="+")
+    audit.add_argument("--profile", default=DEFAULT_PROFILE)
+
+    run = commands.add_parser("bulk", help="Audit every URL in a CSV / NDJSON / text file, resumably.")
+    run.add_argument("input", help="CSV with a url column (or URLs in the first column), NDJSON or one URL per line")
+    run.add_argument("--out", required=True, help="NDJSON output, one line per input row, in input order")
+    run.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    run.add_argument("--profile", default=DEFAULT_PROFILE)
+    run.add_argument("--format", choices=("verbose", "compact"), default="verbose",
+                     help="compact: catalog codes instead of texts (see GET /checks)")
+    run.add_argument("--checkpoint", help="checkpoint file (default: <out>.checkpoint)")
+    run.add_argument("--fresh", action="store_true", help="ignore any checkpoint and overwrite the output")
+
+    args = parser.parse_args(argv)
+    # A typo in --profile should stop the run here, not fail every row of a long bulk file
+    try:
+        get_plan(args.profile)
+    except ProfileError as e:
+        parser.error(str(e))
+    if args.command == "audit":
+        asyncio.run(_audit(args.urls, args.profile))
+        return
+    try:
+        asyncio.run(bulk(args.input, args.out, args.concurrency, args.profile, args.format == "compact",
+                         args.fresh, args.checkpoint))
+    except KeyboardInterrupt:
+        print("\n⏸️ Interrupted, progress saved; run the same command again to resume.", file=sys.stderr)
+        sys.exit(130)
+
+
+if __name__ == "__main__":
+    main()
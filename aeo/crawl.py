@@ -0,0 +1,226 @@
+import asyncio
+import time
+import zlib
+from urllib.parse import urljoin, urlparse
+from xml.etree.ElementTree import XMLPullParser
+
+from .analyzer import analyze_aeo_async, load_robots
+from .http import get_pool, normalize_url
+
+DEFAULT_MAX_PAGES = 1000
+MAX_SITEMAP_DEPTH = 3          # sitemap index -> sitemap -> ... nesting we follow
+MAX_SITEMAP_BYTES = 50 * 1024 * 1024   # per (decompressed) sitemap file, as in the sitemaps.org spec
+
+
+async def iter_sitemap(client, sitemap_url, depth=0, seen=None):
+    """
+    Stream page URLs out of a sitemap without loading it whole.
+    Follows sitemap indexes (up to MAX_SITEMAP_DEPTH) and gunzips .xml.gz files on the fly.
+    Broken or missing sitemaps just yield nothing.
+    """
+    seen = seen if seen is not None else set()
+    if depth > MAX_SITEMAP_DEPTH or sitemap_url in seen:
+        return
+    seen.add(sitemap_url)
+
+    parser = XMLPullParser(events=("start", "end"))
+    stack = []
+    children = []
+
+    def drain():
+        for event, elem in parser.read_events():
+            name = elem.tag.rsplit("}", 1)[-1]
+            if event == "start":
+                stack.append(name)
+                continue
+            stack.pop()
+            if name == "loc" and elem.text and stack:
+                loc = elem.text.strip()
+                if stack[-1] == "url":
+                    yield loc
+                elif stack[-1] == "sitemap":
+                    children.append(loc)
+            elif name in ("url", "sitemap"):
+                elem.clear()
+
+    try:
+        async with client.stream("GET", sitemap_url, timeout=10) as response:
+            if response.status_code != 200:
+                return
+            inflate = None
+            size = 0
+            first = True
+            async for chunk in response.aiter_bytes():
+                if first:
+                    first = False
+                    if chunk[:2] == b"\x1f\x8b":
+                        inflate = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                if inflate is not None:
+                    chunk = inflate.decompress(chunk)
+                size += len(chunk)
+                if size > MAX_SITEMAP_BYTES:
+                    break
+                parser.feed(chunk)
+                for loc in drain():
+                    yield loc
+    except Exception:
+        # Broken XML, bad gzip, dropped connection: the URLs read so far still count
+        pass
+
+    for child in children:
+        async for loc in iter_sitemap(client, child, depth + 1, seen):
+            yield loc
+
+
+class HostGate:
+    """
+    Politeness per host: at most `per_host` audits at once, and `delay` seconds
+    between request starts (robots.txt Crawl-delay).
+    """
+
+    def __init__(self, per_host, delay):
+        self.slots = asyncio.Semaphore(per_host)
+        self.delay = delay
+        self.next_start = 0.0
+
+    async def __aenter__(self):
+        await self.slots.acquire()
+        if self.delay:
+            now = time.monotonic()
+            wait = self.next_start - now
+            self.next_start = max(now, self.next_start) + self.delay
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+    async def __aexit__(self, *exc):
+        self.slots.release()
+
+
+class SiteAggregate:
+    """
+    Running site-level summary, updated as page results come in.
+    """
+
+    def __init__(self, site):
+        self.site = site
+        self.pages = 0
+        self.errors = 0
+        self.total_score = 0
+        self.min_score = None
+        self.max_score = None
+        self.passes = {}
+        self.histogram = [0] * 11   # scores 0, 10, ... 100
+
+    def add(self, result):
+        self.pages += 1
+        if "error" in result:
+            self.errors += 1
+            return
+        score = result["score"]
+        self.total_score += score
+        self.min_score = score if self.min_score is None else min(self.min_score, score)
+        self.max_score = score if self.max_score is None else max(self.max_score, score)
+        self.histogram[min(score // 10, 10)] += 1
+        for item in result["results"]:
+            self.passes[item["title"]] = self.passes.get(item["title"], 0) + (item["status"] == "Pass")
+
+    def summary(self):
+        audited = self.pages - self.errors
+        return {
+            "site": self.site,
+            "pages": self.pages,
+            "errors": self.errors,
+            "average_score": round(self.total_score / audited, 1) if audited else 0,
+            "min_score": self.min_score,
+            "max_score": self.max_score,
+            "score_histogram": self.histogram,
+            "check_pass_rate": {title: round(count / audited, 3) for title, count in self.passes.items()} if audited else {},
+        }
+
+
+async def crawl_site(url, max_pages=DEFAULT_MAX_PAGES, concurrency=20, per_host=4, client=None, profile=None):
+    """
+    Audit a whole site from its sitemaps (robots.txt Sitemap: lines, else /sitemap.xml).
+    Async generator of events:
+    {"type": "page", ...analyze_aeo result} as each page finishes (completion order),
+    then one {"type": "site", ...aggregate}.
+
+    URLs are deduplicated, limited to the start URL's host, filtered by robots.txt,
+    and audited by `concurrency` workers behind a per-host gate honoring Crawl-delay.
+    Every page is scored with the scoring `profile` (aeo.profiles).
+    """
+    if not url.startswith("http"):
+        url = "https://" + url
+    if client is None:
+        client = get_pool()
+
+    parsed = urlparse(url)
+    base_domain = f"{parsed.scheme}://{parsed.netloc}"
+    host = urlparse(normalize_url(url)).netloc
+    # Same cached robots.txt fetch the page audits use
+    robots = await load_robots(client, base_domain)
+    gate = HostGate(per_host, robots.crawl_delay("*") or 0)
+    sitemaps = [urljoin(base_domain, loc) for loc in robots.sitemaps] or [urljoin(base_domain, "/sitemap.xml")]
+
+    # Bounded queue: the sitemap reader waits for the workers instead of buffering 100k URLs
+    frontier = asyncio.Queue(maxsize=concurrency * 4)
+    results = asyncio.Queue()
+    seen = set()
+    aggregate = SiteAggregate(base_domain)
+
+    async def produce():
+        async def candidates():
+            yield url
+            visited = set()
+            for sitemap in sitemaps:
+                async for loc in iter_sitemap(client, sitemap, seen=visited):
+                    yield loc
+
+        cancelled = False
+        try:
+            async for candidate in candidates():
+                if len(seen) >= max_pages:
+                    break
+                try:
+                    key = normalize_url(urljoin(base_domain, candidate))
+                    if urlparse(key).netloc != host:
+                        continue
+                except ValueError:
+                    continue   # malformed <loc> (e.g. "http://[bad"): skip it, not the crawl
+                if key in seen or not robots.can_fetch("*", key):
+                    continue
+                seen.add(key)
+                await frontier.put(key)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            # One stop marker per worker, also when the sitemap reader failed, or they wait forever
+            if not cancelled:
+                for _ in range(concurrency):
+                    await frontier.put(None)
+
+    async def work():
+        while True:
+            page = await frontier.get()
+            if page is None:
+                break
+            async with gate:
+                result = await analyze_aeo_async(page, client, profile=profile)
+            await results.put(result)
+        await results.put(None)
+
+    tasks = [asyncio.ensure_future(produce())] + [asyncio.ensure_future(work()) for _ in range(concurrency)]
+    try:
+        running = concurrency
+        while running:
+            result = await results.get()
+            if result is None:
+                running -= 1
+                continue
+            aggregate.add(result)
+            yield {"type": "page", **result}
+        yield {"type": "site", **aggregate.summary()}
+    finally:
+        for task in tasks:
+            task.cancel()
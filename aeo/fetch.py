@@ -0,0 +1,139 @@
+import codecs
+import hashlib
+import os
+import re
+
+# Stop downloading after this many bytes; the checks run on what we have and report truncation
+MAX_BODY_BYTES = int(os.environ.get("AEO_MAX_BODY_BYTES", 5 * 1024 * 1024))
+
+# Anything else (PDF, images, zip...) is rejected before the body is read
+HTML_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+
+# How many bytes to look at for a <meta charset> before we start decoding
+SNIFF_BYTES = 1024
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-zA-Z0-9_.:-]+)""", re.I)
+
+# Browsers decode these labels with a wider codec; so do we
+_CHARSET_ALIASES = {"euc-kr": "cp949", "ks_c_5601-1987": "cp949", "gb2312": "gb18030", "gbk": "gb18030",
+                    "iso-8859-1": "cp1252", "latin1": "cp1252", "ascii": "cp1252", "us-ascii": "cp1252"}
+
+_BOMS = ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16"))
+
+
+class NotHTMLError(Exception):
+    pass
+
+
+def _codec(label):
+    label = label.strip().lower()
+    label = _CHARSET_ALIASES.get(label, label)
+    try:
+        return codecs.lookup(label).name
+    except LookupError:
+        return None
+
+
+def sniff_encoding(head, header_charset=None):
+    """
+    Pick the body encoding from the first bytes: BOM, then Content-Type charset,
+    then <meta charset>, then UTF-8.
+    """
+    for bom, name in _BOMS:
+        if head.startswith(bom):
+            return name
+    if header_charset and _codec(header_charset):
+        return _codec(header_charset)
+    match = _META_CHARSET.search(head)
+    if match and _codec(match.group(1).decode("ascii", "ignore")):
+        return _codec(match.group(1).decode("ascii", "ignore"))
+    return "utf-8"
+
+
+class BodyDecoder:
+    """
+    Incremental bytes -> str decoder. Holds back the first SNIFF_BYTES to detect the charset,
+    then decodes chunk by chunk (multi-byte characters split across chunks are handled).
+    """
+
+    def __init__(self, header_charset=None):
+        self.header_charset = header_charset
+        self.encoding = None
+        self._decoder = None
+        self._head = b""
+
+    def decode(self, chunk, final=False):
+        if self._decoder is None:
+            self._head += chunk
+            if len(self._head) < SNIFF_BYTES and not final:
+                return ""
+            self.encoding = sniff_encoding(self._head[:SNIFF_BYTES], self.header_charset)
+            self._decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+            chunk, self._head = self._head, b""
+        return self._decoder.decode(chunk, final)
+
+
+async def stream_html(client, url, on_text, max_bytes=MAX_BODY_BYTES, timeout=10, should_stop=None, headers=None,
+                      trace=None, on_bytes=None):
+    """
+    Stream an HTML page into `on_text(str)` without holding the whole body.
+    Reading stops at `max_bytes` (truncated) or as soon as `should_stop()` is true.
+    `headers` can carry If-None-Match / If-Modified-Since; a 304 returns with no body read.
+    `trace` is an optional httpx trace callback (see aeo.metrics.RequestTrace).
+    With `on_bytes(bytes)` instead of `on_text`, raw chunks are passed through undecoded;
+    encoding is then just the Content-Type charset (or None) and decoded_chars stays 0.
+    Raises httpx errors for bad statuses and NotHTMLError for non-HTML content types.
+    Returns fetch metrics: status, content_type, encoding, bytes, decoded_chars, truncated,
+    stopped_early, plus etag / last_modified validators and body_hash of the bytes read.
+    """
+    info = {"status": None, "content_type": None, "encoding": None, "bytes": 0,
+            "decoded_chars": 0, "truncated": False, "stopped_early": False,
+            "etag": None, "last_modified": None, "body_hash": None}
+
+    extensions = {"trace": trace} if trace is not None else None
+    async with client.stream("GET", url, timeout=timeout, headers=headers, extensions=extensions) as response:
+        info["status"] = response.status_code
+        info["etag"] = response.headers.get("etag")
+        info["last_modified"] = response.headers.get("last-modified")
+        if response.status_code == 304:
+            return info
+        response.raise_for_status()
+
+        content_type = response.headers.get("content-type", "")
+        info["content_type"] = content_type.split(";")[0].strip().lower() or None
+        if info["content_type"] and info["content_type"] not in HTML_TYPES:
+            raise NotHTMLError(f"Not an HTML page ({info['content_type']}).")
+
+        decoder = BodyDecoder(response.charset_encoding)
+        digest = hashlib.blake2b(digest_size=16)
+        async for chunk in response.aiter_bytes():
+            room = max_bytes - info["bytes"]
+            if len(chunk) > room:
+                chunk = chunk[:room]
+                info["truncated"] = True
+            info["bytes"] += len(chunk)
+            digest.update(chunk)
+            if on_bytes is not None:
+                on_bytes(chunk)
+            else:
+                text = decoder.decode(chunk)
+                if text:
+                    info["decoded_chars"] += len(text)
+                    on_text(text)
+            if info["truncated"]:
+                break
+            if should_stop is not None and should_stop():
+                info["stopped_early"] = True
+                break
+
+        if on_bytes is not None:
+            info["encoding"] = response.charset_encoding
+        else:
+            text = decoder.decode(b"", final=True)
+            if text:
+                info["decoded_chars"] += len(text)
+                on_text(text)
+            info["encoding"] = decoder.encoding
+        info["body_hash"] = digest.hexdigest()
+
+    return info
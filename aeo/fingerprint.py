@@ -0,0 +1,81 @@
+import hashlib
+
+# Not visible text: the same set the content volume check skips
+from .text import HEADINGS, HIDDEN
+
+# Page parts we fingerprint -> the checks that read them
+FACETS = {
+    "head": ("meta_description", "open_graph", "viewport"),
+    "outline": ("headers",),
+    "structured": ("json_ld",),
+    "text": ("content_volume",),
+    "links": ("internal_links",),
+    "images": ("image_alt",),
+}
+
+
+def _digest():
+    return hashlib.blake2b(digest_size=8)
+
+
+class Fingerprinter:
+    """
+    Parser observer that hashes the parts of a page the checks look at, so two audits
+    of a URL can tell what changed: head metadata, heading outline, JSON-LD blocks,
+    visible text, the link set and the image set. Attach with RuleEngine(observer=...).
+    """
+
+    def __init__(self):
+        self._hashes = {"head": _digest(), "outline": _digest(), "structured": _digest(), "text": _digest()}
+        self.links = set()
+        self.images = set()
+        self._in_head = True
+        self._capture = None
+        self._hidden = 0
+
+    def start(self, tag, attrs):
+        if tag == "body":
+            self._in_head = False
+        if tag in ("meta", "link") and self._in_head:
+            self._hashes["head"].update(repr(sorted(attrs.items())).encode())
+        elif tag == "title":
+            self._capture = "head"
+        elif tag in HEADINGS:
+            self._hashes["outline"].update(tag.encode())
+            self._capture = "outline"
+        elif tag == "a" and attrs.get("href"):
+            self.links.add(attrs["href"])
+        elif tag == "img":
+            self.images.add((attrs.get("src") or "", attrs.get("alt") or ""))
+        if tag in HIDDEN:
+            self._hidden += 1
+            if tag == "script" and attrs.get("type") == "application/ld+json":
+                self._capture = "structured"
+
+    def end(self, tag):
+        if tag == "head":
+            self._in_head = False
+        if tag in HIDDEN and self._hidden:
+            self._hidden -= 1
+        if tag in ("title", "script") or tag in HEADINGS:
+            self._capture = None
+
+    def data(self, data):
+        # Word-normalized, so re-indented markup or split text nodes hash the same
+        words = data.split()
+        if not words:
+            return
+        normalized = (" ".join(words) + " ").encode()
+        if self._capture is not None:
+            self._hashes[self._capture].update(normalized)
+        if not self._hidden:
+            self._hashes["text"].update(normalized)
+
+    def fingerprints(self):
+        result = {facet: digest.hexdigest() for facet, digest in self._hashes.items()}
+        for facet, values in (("links", self.links), ("images", self.images)):
+            digest = _digest()
+            for value in sorted(values):
+                digest.update(repr(value).encode())
+            result[facet] = digest.hexdigest()
+        return result
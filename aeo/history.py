@@ -0,0 +1,260 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+
+from .catalog import catalog
+from .links import registrable_domain
+from .metrics import registry
+
+# Every finished audit is appended here. Empty turns history off.
+DB_PATH = os.environ.get("AEO_HISTORY_DB", "aeo_history.db")
+# The writer thread commits this many audits per transaction, or whatever it has after FLUSH_SECONDS
+BATCH_SIZE = 200
+FLUSH_SECONDS = 1.0
+# Audits waiting for the writer; past this they are dropped rather than slowing audits down
+MAX_PENDING = 10000
+# Time-series bucket sizes for score_series
+BUCKETS = {"hour": 3600, "day": 86400, "week": 7 * 86400}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS audits (
+    id INTEGER PRIMARY KEY,
+    domain TEXT NOT NULL,
+    url TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    ts REAL NOT NULL,
+    score INTEGER NOT NULL,
+    checks TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS audits_domain_url_ts ON audits (domain, url, ts);
+"""
+
+DROPPED = registry.counter("aeo_history_dropped_total", "Audits not written to history (queue full).")
+
+
+def domain_of(url):
+    """
+    History is grouped by registrable domain: www.example.com and blog.example.com are example.com.
+    """
+    if not url.startswith("http"):
+        url = "https://" + url
+    return registrable_domain(urlsplit(url).hostname or "")
+
+
+class HistoryStore:
+    """
+    Append-only audit history: score and check statuses per audit, indexed by
+    (domain, url, time). SQLite in WAL mode, like the job store, so reads never wait on the writer.
+    """
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(SCHEMA)
+
+    @staticmethod
+    def row(result, ts=None):
+        """
+        analyze_aeo result -> an audits row, or None for failed audits (a flaky fetch is not a score).
+        """
+        if "error" in result:
+            return None
+        checks = {item["id"]: item["status"] for item in result["results"]}
+        return (domain_of(result["url"]), result["url"], result.get("profile") or "", ts or time.time(),
+                result["score"], json.dumps(checks))
+
+    def append(self, rows):
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(
+                    "INSERT INTO audits (domain, url, profile, ts, score, checks) VALUES (?, ?, ?, ?, ?, ?)", rows)
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _where(self, domain, url, profile, since, until):
+        clauses = ["domain = ?"]
+        params = [domain]
+        if url:
+            clauses.append("url = ?")
+            params.append(url)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(until)
+        if profile:
+            clauses.append("profile = ?")
+            params.append(profile)
+        return " AND ".join(clauses), params
+
+    def score_series(self, domain, url=None, profile=None, since=None, until=None, bucket="day"):
+        """
+        Score over time for a domain (or one URL): average / min / max per time bucket,
+        plus first -> last bucket change, which answers "has my score improved?".
+        """
+        size = BUCKETS[bucket]
+        where, params = self._where(domain, url, profile, since, until)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT CAST(ts / ? AS INTEGER) * ? AS bucket, AVG(score) AS avg, MIN(score) AS min, "
+                f"MAX(score) AS max, COUNT(*) AS audits, COUNT(DISTINCT url) AS urls "
+                f"FROM audits WHERE {where} GROUP BY bucket ORDER BY bucket", [size, size] + params).fetchall()
+        points = [{"t": row["bucket"], "avg": round(row["avg"], 1), "min": row["min"], "max": row["max"],
+                   "audits": row["audits"], "urls": row["urls"]} for row in rows]
+        trend = None
+        if points:
+            first, last = points[0]["avg"], points[-1]["avg"]
+            delta = round(last - first, 1)
+            trend = {"first": first, "last": last, "delta": delta,
+                     "direction": "up" if delta > 0 else "down" if delta < 0 else "flat"}
+        return {"domain": domain, "url": url, "bucket": bucket, "points": points, "trend": trend}
+
+    def regressions(self, domain, profile=None, since=None, until=None):
+        """
+        Per check: the URLs of the domain whose status went Pass -> Fail (or Fail -> Pass)
+        between their first and latest audit in the window.
+        """
+        where, params = self._where(domain, None, profile, since, until)
+        first = {}
+        last = {}
+        with self._lock:
+            # The (domain, url, ts) index hands these back already in order
+            cursor = self._db.execute(f"SELECT url, ts, checks FROM audits WHERE {where} ORDER BY url, ts", params)
+            for row in cursor:
+                first.setdefault(row["url"], row)
+                last[row["url"]] = row
+        titles = {check["id"]: check["title"] for check in catalog()["checks"]}
+        checks = {}
+        for url, before_row in first.items():
+            after_row = last[url]
+            if after_row is before_row:
+                continue
+            before = json.loads(before_row["checks"])
+            after = json.loads(after_row["checks"])
+            for check_id, status in after.items():
+                previous = before.get(check_id)
+                if previous is None or previous == status:
+                    continue
+                entry = checks.setdefault(check_id, {"id": check_id, "title": titles.get(check_id, check_id),
+                                                     "regressed": [], "improved": []})
+                entry["regressed" if status != "Pass" else "improved"].append(
+                    {"url": url, "before": previous, "after": status, "at": after_row["ts"]})
+        ordered = sorted(checks.values(), key=lambda entry: (-len(entry["regressed"]), entry["id"]))
+        return {
+            "domain": domain,
+            "urls": len(first),
+            "regressed": sum(len(entry["regressed"]) for entry in ordered),
+            "improved": sum(len(entry["improved"]) for entry in ordered),
+            "checks": ordered,
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class HistoryWriter:
+    """
+    Background thread that batches queued audits into the store, so recording an audit
+    is a put_nowait on the request path and the disk sees one transaction per batch.
+    """
+
+    def __init__(self, store, batch_size=BATCH_SIZE, flush_seconds=FLUSH_SECONDS, max_pending=MAX_PENDING):
+        self.store = store
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.written = 0
+        self._queue = queue.Queue(max_pending)
+        self._thread = threading.Thread(target=self._run, name="aeo-history", daemon=True)
+        self._thread.start()
+
+    def record(self, result):
+        row = HistoryStore.row(result)
+        if row is None:
+            return
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            DROPPED.inc()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=self.flush_seconds)
+            except queue.Empty:
+                continue
+            rows = []
+            deadline = time.monotonic() + self.flush_seconds
+            while True:
+                if item is None:
+                    stopping = True
+                else:
+                    rows.append(item)
+                if stopping or len(rows) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            if rows:
+                try:
+                    self.store.append(rows)
+                    self.written += len(rows)
+                except Exception as e:
+                    DROPPED.inc(len(rows))
+                    print(f"⚠️ History write failed: {e}")
+
+    def stop(self):
+        """
+        Flush what is queued and stop the thread.
+        """
+        self._queue.put(None)
+        self._thread.join()
+
+
+_store = None
+_writer = None
+
+
+def start_history(path=DB_PATH):
+    """
+    Open the history store and start its writer (the API lifespans call this).
+    Until then record_history is a no-op, so scripts and tests write nothing.
+    """
+    global _store, _writer
+    if _writer is None and path:
+        _store = HistoryStore(path)
+        _writer = HistoryWriter(_store)
+    return _store
+
+
+def record_history(result):
+    if _writer is not None:
+        _writer.record(result)
+
+
+def get_history():
+    return _store
+
+
+def stop_history():
+    global _store, _writer
+    if _writer is not None:
+        _writer.stop()
+        _store.close()
+    _store = None
+    _writer = None
@@ -0,0 +1,186 @@
+import asyncio
+import os
+import socket
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from ipaddress import ip_address
+from urllib.parse import urlparse, urlunparse
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+MAX_CONNECTIONS = int(os.environ.get("AEO_HTTP_MAX_CONNECTIONS", 200))
+MAX_PER_HOST = int(os.environ.get("AEO_HTTP_MAX_PER_HOST", 6))
+KEEPALIVE_EXPIRY = float(os.environ.get("AEO_HTTP_KEEPALIVE", 30))
+DNS_TTL = float(os.environ.get("AEO_DNS_TTL", 300))
+# Hosts kept in the DNS cache, least recently used dropped first (bulk runs see millions)
+DNS_MAX_ENTRIES = int(os.environ.get("AEO_DNS_MAX_ENTRIES", 4096))
+
+
+def _http2_available():
+    if os.environ.get("AEO_HTTP2", "auto") == "0":
+        return False
+    try:
+        import h2  # noqa: F401  (installed by `pip install httpx[http2]`)
+        return True
+    except ImportError:
+        return False
+
+
+def _is_ip(host):
+    try:
+        ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+def normalize_url(url):
+    """
+    Canonical form used for dedup: lowercase scheme/host, no default port, no fragment.
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    if (scheme == "http" and netloc.endswith(":80")) or (scheme == "https" and netloc.endswith(":443")):
+        netloc = netloc.rsplit(":", 1)[0]
+    return urlunparse((scheme, netloc, parsed.path or "/", parsed.params, parsed.query, ""))
+
+
+@lru_cache(maxsize=None)
+def _dns_backend_class():
+    # httpx / httpcore (and the async backends they pull in) are the slowest imports we have,
+    # so they load with the first HttpPool instead of with the package
+    import httpcore
+
+    class CachingDNSBackend(httpcore.AnyIOBackend):
+        """
+        Network backend that resolves each host once per `ttl` seconds.
+        We connect to the cached address; TLS still uses the original hostname for SNI.
+        At most `max_entries` hosts are cached (LRU).
+        """
+
+        def __init__(self, ttl=DNS_TTL, max_entries=DNS_MAX_ENTRIES):
+            self.ttl = ttl
+            self.max_entries = max_entries
+            self._cache = OrderedDict()
+
+        async def _resolve(self, host, port, timeout):
+            now = time.monotonic()
+            key = (host, port)
+            entry = self._cache.get(key)
+            if entry and entry[0] > now:
+                self._cache.move_to_end(key)
+                return entry[1]
+            loop = asyncio.get_running_loop()
+            infos = await asyncio.wait_for(loop.getaddrinfo(host, port, type=socket.SOCK_STREAM), timeout)
+            address = infos[0][4][0]
+            self._cache[key] = (now + self.ttl, address)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+            return address
+
+        async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+            if not _is_ip(host):
+                try:
+                    host = await self._resolve(host, port, timeout)
+                except (OSError, asyncio.TimeoutError):
+                    pass  # let the regular connect raise a proper httpx.ConnectError
+            return await super().connect_tcp(host, port, timeout, local_address, socket_options)
+
+    return CachingDNSBackend
+
+
+class HttpPool:
+    """
+    Shared HTTP client for audits: keep-alive connections, optional HTTP/2,
+    cached DNS and a cap on concurrent requests per host.
+    """
+
+    def __init__(self, max_connections=MAX_CONNECTIONS, max_per_host=MAX_PER_HOST,
+                 keepalive_expiry=KEEPALIVE_EXPIRY, http2=None):
+        import httpx
+
+        if http2 is None:
+            http2 = _http2_available()
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        transport = httpx.AsyncHTTPTransport(http2=http2, limits=limits)
+        # httpx has no public hook for the resolver, so swap the pool's network backend
+        transport._pool._network_backend = _dns_backend_class()()
+        self.client = httpx.AsyncClient(transport=transport, headers=HEADERS, follow_redirects=True)
+        self._parse_url = httpx.URL
+        self.http2 = http2
+        self.max_per_host = max_per_host
+        self._host_slots = {}   # host -> [semaphore, requests holding or waiting]
+
+    @asynccontextmanager
+    async def _slot(self, url):
+        # A host's semaphore lives only while someone uses it, so a run over a million
+        # distinct hosts does not keep a million semaphores
+        host = self._parse_url(url).host
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = [asyncio.Semaphore(self.max_per_host), 0]
+        slot[1] += 1
+        try:
+            async with slot[0]:
+                yield
+        finally:
+            slot[1] -= 1
+            if not slot[1]:
+                del self._host_slots[host]
+
+    async def get(self, url, **kwargs):
+        async with self._slot(url):
+            return await self.client.get(url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method, url, **kwargs):
+        """
+        Like httpx.AsyncClient.stream; the per-host slot is held until the body is closed.
+        """
+        async with self._slot(url):
+            async with self.client.stream(method, url, **kwargs) as response:
+                yield response
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+_pool = None
+_pool_loop = None
+
+
+def get_pool():
+    """
+    Process-wide pool, created on first use.
+    A new one is made if the event loop changed (e.g. repeated asyncio.run calls).
+    """
+    global _pool, _pool_loop
+    loop = asyncio.get_running_loop()
+    if _pool is None or _pool_loop is not loop:
+        _pool = HttpPool()
+        _pool_loop = loop
+    return _pool
+
+
+async def close_pool():
+    global _pool, _pool_loop
+    if _pool is not None:
+        await _pool.aclose()
+    _pool = None
+    _pool_loop = None
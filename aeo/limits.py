@@ -0,0 +1,165 @@
+import asyncio
+import math
+import os
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+from .http import normalize_url
+from .metrics import registry
+
+# Per client: sustained audits per second and burst size. AEO_RATE_LIMIT=0 turns it off.
+DEFAULT_RATE = 1.0
+DEFAULT_BURST = 10
+# Audits running at once against one target origin, and how many more may wait for a slot
+DEFAULT_PER_ORIGIN = 4
+DEFAULT_ORIGIN_QUEUE = 16
+# Audits running at once in this process (after coalescing)
+DEFAULT_MAX_INFLIGHT = 200
+# Clients remembered by the rate limiter, least recently seen dropped first
+MAX_CLIENTS = 10000
+# Only behind a proxy that sets X-Forwarded-For itself (Vercel does, api/index.py turns this on).
+# Anywhere else a client could send any address there and get a fresh bucket every request.
+TRUST_FORWARDED = os.environ.get("AEO_TRUST_FORWARDED", "0") == "1"
+
+SHED = registry.counter("aeo_requests_shed_total", "Requests rejected with 429.", labels=("reason",))
+COALESCED = registry.counter("aeo_audits_coalesced_total", "Requests that joined an identical in-flight audit.")
+
+
+class Overloaded(Exception):
+    """
+    Admission refused. `reason` is "rate", "origin" or "capacity"; `retry_after` is in seconds.
+    """
+
+    def __init__(self, reason, retry_after):
+        super().__init__(f"Too many requests ({reason}), retry in {retry_after}s.")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class RateLimiter:
+    """
+    Token bucket per client key (IP address): `rate` tokens per second, up to `burst`.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, max_clients=MAX_CLIENTS):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()
+
+    def check(self, client):
+        """
+        Take a token for `client`. Raises Overloaded when its bucket is empty.
+        """
+        if self.rate <= 0:
+            return
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(client, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens < 1:
+            self._buckets[client] = (tokens, now)
+            SHED.inc(reason="rate")
+            raise Overloaded("rate", max(1, math.ceil((1 - tokens) / self.rate)))
+        self._buckets[client] = (tokens - 1, now)
+        while len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+
+
+class Admission:
+    """
+    Admission control for audits: identical in-flight audits (same normalized URL and options)
+    share one run, and the runs themselves are capped per target origin and per process.
+    Callers over a cap get Overloaded instead of piling up; a few may queue per origin.
+    """
+
+    def __init__(self, per_origin=DEFAULT_PER_ORIGIN, origin_queue=DEFAULT_ORIGIN_QUEUE,
+                 max_inflight=DEFAULT_MAX_INFLIGHT):
+        self.per_origin = per_origin
+        self.origin_queue = origin_queue
+        self.max_inflight = max_inflight
+        self.inflight = 0
+        self.coalesced = 0
+        # Smoothed audit duration, for Retry-After
+        self.avg_seconds = 1.0
+        self._runs = {}
+        self._origins = {}   # origin -> [semaphore, callers holding or waiting]
+
+    def _retry_after(self, ahead):
+        return max(1, math.ceil(self.avg_seconds * ahead / max(1, self.per_origin)))
+
+    async def run(self, url, options, audit):
+        """
+        Run `audit()` (a coroutine function) for `url`, or join the identical run already going.
+        `options` is anything hashable that changes the result (e.g. the profile).
+        """
+        normalized = normalize_url(url if url.startswith("http") else "https://" + url)
+        key = (normalized, options)
+        future = self._runs.get(key)
+        if future is not None:
+            self.coalesced += 1
+            COALESCED.inc()
+            return await asyncio.shield(future)
+        future = asyncio.ensure_future(self._admit(urlsplit(normalized).netloc, audit))
+        self._runs[key] = future
+        future.add_done_callback(lambda _: self._runs.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def _admit(self, origin, audit):
+        if self.inflight >= self.max_inflight:
+            SHED.inc(reason="capacity")
+            raise Overloaded("capacity", self._retry_after(self.inflight))
+        slot = self._origins.get(origin)
+        if slot is None:
+            slot = self._origins[origin] = [asyncio.Semaphore(self.per_origin), 0]
+        if slot[1] >= self.per_origin + self.origin_queue:
+            SHED.inc(reason="origin")
+            raise Overloaded("origin", self._retry_after(slot[1]))
+        slot[1] += 1
+        self.inflight += 1
+        try:
+            async with slot[0]:
+                started = time.monotonic()
+                result = await audit()
+                self.avg_seconds = 0.8 * self.avg_seconds + 0.2 * (time.monotonic() - started)
+                return result
+        finally:
+            self.inflight -= 1
+            slot[1] -= 1
+            if not slot[1]:
+                del self._origins[origin]
+
+    def stats(self):
+        return {
+            "inflight": self.inflight,
+            "coalescing": len(self._runs),
+            "coalesced": self.coalesced,
+            "origins": len(self._origins),
+            "avg_seconds": round(self.avg_seconds, 3),
+        }
+
+
+def client_key(request):
+    """
+    Rate-limit key for a Starlette request: the peer address (uvicorn's --proxy-headers already
+    rewrites it for its trusted proxies). With AEO_TRUST_FORWARDED=1, the X-Forwarded-For hop
+    our proxy appended (the last one) instead.
+    """
+    if TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.rsplit(",", 1)[-1].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def limits_from_env():
+    """
+    (RateLimiter, Admission) from AEO_RATE_LIMIT, AEO_RATE_BURST, AEO_ORIGIN_CONCURRENCY,
+    AEO_ORIGIN_QUEUE and AEO_MAX_INFLIGHT.
+    """
+    limiter = RateLimiter(float(os.environ.get("AEO_RATE_LIMIT", DEFAULT_RATE)),
+                          int(os.environ.get("AEO_RATE_BURST", DEFAULT_BURST)))
+    admission = Admission(int(os.environ.get("AEO_ORIGIN_CONCURRENCY", DEFAULT_PER_ORIGIN)),
+                          int(os.environ.get("AEO_ORIGIN_QUEUE", DEFAULT_ORIGIN_QUEUE)),
+                          int(os.environ.get("AEO_MAX_INFLIGHT", DEFAULT_MAX_INFLIGHT)))
+    return limiter, admission
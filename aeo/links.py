@@ -0,0 +1,126 @@
+from functools import lru_cache
+from ipaddress import ip_address
+
+# Multi-label public suffixes we see in audits. Anything else is treated as a one-label
+# TLD, so registrable domain = last two labels. Not the full Public Suffix List, on purpose.
+PUBLIC_SUFFIXES = frozenset((
+    "co.kr", "or.kr", "ne.kr", "go.kr", "ac.kr", "re.kr", "pe.kr", "hs.kr", "ms.kr", "es.kr", "sc.kr",
+    "seoul.kr", "busan.kr",
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "me.uk", "ltd.uk", "plc.uk",
+    "co.jp", "ne.jp", "or.jp", "ac.jp", "go.jp",
+    "com.au", "net.au", "org.au", "edu.au", "gov.au",
+    "com.cn", "net.cn", "org.cn", "com.tw", "com.hk", "com.sg", "com.my", "co.id", "co.th",
+    "com.vn", "co.in", "co.nz", "com.br", "com.mx", "com.ar", "com.tr", "co.za",
+    "github.io", "vercel.app", "netlify.app", "herokuapp.com", "pages.dev", "blogspot.com",
+))
+
+# Links that never leave the page as a navigable URL
+SKIP_SCHEMES = ("javascript", "mailto", "tel", "sms", "data", "about", "blob")
+
+INTERNAL = "internal"
+EXTERNAL = "external"
+SKIPPED = "skipped"
+BROKEN = "broken"
+
+
+@lru_cache(maxsize=4096)
+def registrable_domain(host):
+    """
+    "shop.example.co.kr" -> "example.co.kr", "www.example.com" -> "example.com".
+    IP addresses and single-label hosts (localhost) are returned as they are.
+    """
+    host = host.rstrip(".").lower()
+    try:
+        ip_address(host.strip("[]"))
+        return host
+    except ValueError:
+        pass
+    labels = host.split(".")
+    if len(labels) <= 2:
+        return host
+    if ".".join(labels[-2:]) in PUBLIC_SUFFIXES:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def split_host(authority):
+    """
+    Host part of a URL authority ("user@host:port"), lowercased, or None if it is not a valid host.
+    """
+    authority = authority.rpartition("@")[2]
+    if authority.startswith("["):
+        end = authority.find("]")
+        return authority[:end + 1].lower() if end > 0 else None
+    host = authority.partition(":")[0].lower()
+    if not host or any(c in host for c in " \t\\<>\"'{}|^`"):
+        return None
+    return host
+
+
+def _authority(rest):
+    # "//host/path?q#f" -> "host"
+    for i, c in enumerate(rest):
+        if c in "/?#":
+            return rest[:i]
+    return rest
+
+
+class LinkClassifier:
+    """
+    Classifies hrefs found on `page_url` without building a URL per anchor:
+    relative links are internal, absolute ones compare hosts by registrable domain
+    (so www. and other subdomains count as internal, example.com.evil.io does not).
+    Hosts already seen are cached per page; mega menus repeat the same few.
+    """
+
+    def __init__(self, page_url):
+        rest = page_url.partition("://")[2]
+        self.host = split_host(_authority(rest)) or ""
+        self.domain = registrable_domain(self.host) if self.host else ""
+        self._hosts = {}
+
+    def classify(self, href):
+        if href is None:
+            return BROKEN
+        href = href.strip()
+        if not href or href[0] == "#":
+            return SKIPPED
+        if href[:2] == "//":
+            return self._by_host(_authority(href[2:]))
+        colon = href.find(":")
+        # A scheme is [a-z0-9+.-] before the first ':'; a ':' after '/', '?' or '#' is just a relative path
+        if colon > 0 and href[0].isalpha() and all(c.isalnum() or c in "+-." for c in href[:colon]):
+            scheme = href[:colon].lower()
+            if scheme in SKIP_SCHEMES:
+                return SKIPPED
+            if scheme not in ("http", "https"):
+                return EXTERNAL   # ftp:, whatsapp:, market: ...
+            rest = href[colon + 1:]
+            if rest[:2] != "//":
+                return BROKEN   # "http:/path", "https:example.com"
+            return self._by_host(_authority(rest[2:]))
+        return INTERNAL
+
+    def _by_host(self, authority):
+        verdict = self._hosts.get(authority)
+        if verdict is None:
+            host = split_host(authority)
+            if host is None:
+                verdict = BROKEN
+            elif host == self.host or registrable_domain(host) == self.domain:
+                verdict = INTERNAL
+            else:
+                verdict = EXTERNAL
+            self._hosts[authority] = verdict
+        return verdict
+
+
+def classify_links(page_url, hrefs):
+    """
+    Batch form: counts of internal / external / skipped / broken for a list of hrefs.
+    """
+    classify = LinkClassifier(page_url).classify
+    counts = {INTERNAL: 0, EXTERNAL: 0, SKIPPED: 0, BROKEN: 0}
+    for href in hrefs:
+        counts[classify(href)] += 1
+    return counts
@@ -0,0 +1,174 @@
+import time
+from bisect import bisect_left
+
+# Seconds: a cached robots.txt lookup at the low end, a timed-out page at the top
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+# Single checks are much cheaper than a fetch
+RULE_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1)
+SIZE_BUCKETS = (1024, 10 * 1024, 100 * 1024, 512 * 1024, 1024 * 1024, 5 * 1024 * 1024)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.labels, key)} {value}")
+        return lines
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with optional labels, rendered in the Prometheus text format.
+    """
+
+    def __init__(self, name, help, buckets, labels=()):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self.labels = labels
+        self._series = {}
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += bucket_count
+                le = 'le="%s"' % bound
+                lines.append(f"{self.name}_bucket{_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {round(total, 6)}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name, help, labels=()):
+        metric = Counter(name, help, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help, buckets=LATENCY_BUCKETS, labels=()):
+        metric = Histogram(name, help, buckets, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+AUDIT_SECONDS = registry.histogram("aeo_audit_seconds", "End-to-end audit time.", labels=("outcome",))
+PHASE_SECONDS = registry.histogram("aeo_phase_seconds", "Time spent per audit phase.", labels=("phase",))
+RULE_SECONDS = registry.histogram("aeo_rule_seconds", "CPU time per check.", RULE_BUCKETS, labels=("rule",))
+BODY_BYTES = registry.histogram("aeo_body_bytes", "Main page bytes read per audit.", SIZE_BUCKETS)
+RESPONSES = registry.counter("aeo_http_responses_total", "Upstream responses by resource and status.",
+                             labels=("resource", "status"))
+
+# httpx trace event prefixes -> our phase names (HTTP/1.1 and HTTP/2 alike)
+_TRACE_PHASES = {
+    "connection.connect_tcp": "connect",
+    "connection.start_tls": "tls",
+    "http11.send_request_headers": "send",
+    "http2.send_request_headers": "send",
+    "http11.receive_response_headers": "wait",
+    "http2.receive_response_headers": "wait",
+    "http11.receive_response_body": "download",
+    "http2.receive_response_body": "download",
+}
+
+
+class RequestTrace:
+    """
+    httpx "trace" extension callback: turns connection / request events into phase
+    durations in seconds. connect includes the DNS lookup; a reused connection has
+    no connect or tls phase.
+
+        trace = RequestTrace()
+        await client.get(url, extensions={"trace": trace})
+        trace.phases  # {"connect": ..., "tls": ..., "wait": ..., "download": ...}
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self._started = {}
+
+    async def __call__(self, event, info):
+        prefix, _, state = event.rpartition(".")
+        phase = _TRACE_PHASES.get(prefix)
+        if phase is None:
+            return
+        if state == "started":
+            self._started[phase] = time.perf_counter()
+        elif phase in self._started:
+            self.phases[phase] = self.phases.get(phase, 0.0) + time.perf_counter() - self._started.pop(phase)
+
+    def ms(self):
+        return {phase: round(seconds * 1000, 3) for phase, seconds in self.phases.items()}
+
+
+def record_audit(result, seconds):
+    """
+    Fold one finished analyze_aeo result into the process-wide histograms.
+    """
+    if "error" in result:
+        outcome = "error"
+    elif result.get("cache") in ("not_modified", "unchanged"):
+        outcome = "cached"
+    else:
+        outcome = "ok"
+    AUDIT_SECONDS.observe(seconds, outcome=outcome)
+    fetch = result.get("fetch")
+    if fetch:
+        RESPONSES.inc(resource="page", status=fetch["status"])
+        BODY_BYTES.observe(fetch["bytes"])
+    timings = result.get("timings")
+    if outcome != "ok" or not timings:
+        return
+    for phase in ("fetch_main", "fetch_robots", "fetch_sitemap", "parse"):
+        if timings.get(phase) is not None:
+            PHASE_SECONDS.observe(timings[phase] / 1000, phase=phase)
+    for phase, ms in timings.get("http", {}).items():
+        PHASE_SECONDS.observe(ms / 1000, phase=phase)
+    for rule_id, ms in timings["rules"].items():
+        RULE_SECONDS.observe(ms / 1000, rule=rule_id)
+
+
+def render():
+    return registry.render()
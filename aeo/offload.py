@@ -0,0 +1,89 @@
+import asyncio
+import os
+import time
+
+from .fetch import SNIFF_BYTES, sniff_encoding
+from .fingerprint import Fingerprinter
+from .profiles import get_plan
+from .render import ShellProbe
+from .rules import AuditContext, RuleEngine
+
+# Processes for parsing + HTML checks. 0 keeps everything on the event loop (streaming, as before).
+PARSE_WORKERS = int(os.environ.get("AEO_PARSE_WORKERS", 0))
+# Smaller pages are evaluated inline: pickling and a round trip would cost more than the parse
+OFFLOAD_MIN_BYTES = int(os.environ.get("AEO_OFFLOAD_MIN_BYTES", 256 * 1024))
+
+_executor = None
+
+
+def evaluate_html(body, header_charset, url, base_domain, rule_ids=None, profile=None, fingerprint=False,
+                  probe=False, backend=None):
+    """
+    Decode raw page bytes and run the HTML checks on them. Runs in a worker process,
+    so it takes and returns only plain data:
+    {"encoding", "decoded_chars", "parser", "parse" (seconds), "outcomes": {rule_id: (status, icon, desc)},
+     "elapsed": {rule_id: seconds}, "details": {rule_id: dict}}. Page-scope checks (robots, sitemap) are left to the caller.
+    The rule classes come from the named scoring profile, compiled again in the worker.
+    With `fingerprint`, the result also carries the page's aeo.fingerprint fingerprints;
+    with `probe`, "shell" is the aeo.render.ShellProbe verdict.
+    """
+    started = time.perf_counter()
+    rules = [rule for rule in get_plan(profile).rules
+             if rule.scope != "page" and (rule_ids is None or rule.id in rule_ids)]
+    fingerprinter = Fingerprinter() if fingerprint else None
+    shell_probe = ShellProbe() if probe else None
+    observers = [observer for observer in (fingerprinter, shell_probe) if observer is not None]
+    engine = RuleEngine(AuditContext(url, base_domain), rules, backend, observer=observers)
+    encoding = sniff_encoding(bytes(body[:SNIFF_BYTES]), header_charset)
+    # One decode of the whole body; no incremental decoder needed, we have every byte
+    text = str(body, encoding, "replace")
+    engine.feed(text)
+    engine.close()
+    engine.settle_html()
+    return {
+        "encoding": encoding,
+        "decoded_chars": len(text),
+        "parser": engine.parser.name,
+        "parse": time.perf_counter() - started,
+        "outcomes": {rule.id: rule.outcome for rule in engine.rules},
+        "elapsed": dict(engine._elapsed),
+        "details": {rule.id: rule.details for rule in engine.rules if rule.details is not None},
+        "fingerprints": fingerprinter.fingerprints() if fingerprinter else None,
+        "shell": shell_probe.verdict() if shell_probe else None,
+    }
+
+
+def get_executor():
+    """
+    Process pool shared by every audit, created on first use. None when offload is off.
+    Spawned (not forked) workers: the API process has threads (sqlite, to_thread) by then.
+    """
+    global _executor
+    if PARSE_WORKERS <= 0:
+        return None
+    if _executor is None:
+        # Only loaded when offload is on: most deployments never need multiprocessing
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        _executor = ProcessPoolExecutor(PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+
+async def evaluate(body, header_charset, url, base_domain, rule_ids=None, profile=None, fingerprint=False,
+                   probe=False):
+    """
+    evaluate_html in the process pool for big pages, inline for small ones.
+    """
+    executor = get_executor()
+    if executor is None or len(body) < OFFLOAD_MIN_BYTES:
+        return evaluate_html(body, header_charset, url, base_domain, rule_ids, profile, fingerprint, probe)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, evaluate_html, body, header_charset, url, base_domain, rule_ids,
+                                      profile, fingerprint, probe)
+
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
@@ -0,0 +1,165 @@
+import importlib.util
+import os
+from functools import lru_cache
+from html.parser import HTMLParser
+
+# Backends tried by "auto", fastest first. html.parser is pure Python and always available.
+PREFERENCE = ("lxml", "selectolax", "html.parser")
+
+
+class StdlibParser(HTMLParser):
+    """
+    Pure-Python backend (the original behavior). Streams: every feed() emits events right away.
+    """
+    name = "html.parser"
+
+    def __init__(self, handler):
+        super().__init__(convert_charrefs=True)
+        self.handler = handler
+
+    def handle_starttag(self, tag, attrs):
+        self.handler.start(tag, dict(attrs))
+
+    def handle_endtag(self, tag):
+        self.handler.end(tag)
+
+    def handle_data(self, data):
+        self.handler.data(data)
+
+    def unknown_decl(self, data):
+        # <![CDATA[...]]> sections are text as far as the checks are concerned
+        if data.startswith("CDATA[") and len(data) > 6:
+            self.handler.data(data[6:])
+
+
+class LxmlParser:
+    """
+    libxml2 backend through lxml's HTMLPullParser. Streams like html.parser, but in C.
+    Text is emitted once it is complete (at the next sibling's start or the parent's end),
+    and finished elements are dropped so the tree never grows past the open path.
+    """
+    name = "lxml"
+
+    def __init__(self, handler):
+        from lxml import etree
+        self.handler = handler
+        self._parser = etree.HTMLPullParser(events=("start", "end"))
+
+    def feed(self, chunk):
+        self._parser.feed(chunk)
+        self._drain()
+
+    def close(self):
+        self._parser.close()
+        self._drain()
+
+    def _drain(self):
+        handler = self.handler
+        for event, el in self._parser.read_events():
+            if event == "start":
+                parent = el.getparent()
+                if parent is not None:
+                    # Everything before this element inside the parent is final now
+                    if parent.text:
+                        handler.data(parent.text)
+                        parent.text = None
+                    previous = el.getprevious()
+                    while previous is not None:
+                        if previous.tail:
+                            handler.data(previous.tail)
+                        parent.remove(previous)
+                        previous = el.getprevious()
+                handler.start(el.tag, dict(el.attrib))
+            else:
+                if el.text:
+                    handler.data(el.text)
+                    el.text = None
+                for child in el:
+                    if child.tail:
+                        handler.data(child.tail)
+                        child.tail = None
+                handler.end(el.tag)
+                el.clear(keep_tail=True)
+
+
+class SelectolaxParser:
+    """
+    Lexbor backend through selectolax. Lexbor has no incremental API, so chunks are
+    buffered and the whole document is parsed and walked on close().
+    """
+    name = "selectolax"
+
+    def __init__(self, handler):
+        from selectolax.lexbor import LexborHTMLParser
+        self.handler = handler
+        self._parse = LexborHTMLParser
+        self._chunks = []
+
+    def feed(self, chunk):
+        self._chunks.append(chunk)
+
+    def close(self):
+        tree = self._parse("".join(self._chunks))
+        self._chunks = []
+        if tree.root is not None:
+            self._walk(tree.root)
+
+    def _walk(self, root):
+        # Iterative depth-first walk, emitting end() when a subtree is done.
+        # Depth is tracked by hand: selectolax hands out a new wrapper object per access.
+        handler = self.handler
+        node = root
+        depth = 0
+        while True:
+            tag = node.tag
+            if tag == "-text":
+                handler.data(node.text_content)
+            elif not tag.startswith("-"):
+                handler.start(tag, node.attributes)
+                if node.child is not None:
+                    node = node.child
+                    depth += 1
+                    continue
+                handler.end(tag)
+            # Move to the next sibling, closing finished parents on the way up
+            while depth and node.next is None:
+                node = node.parent
+                depth -= 1
+                handler.end(node.tag)
+            if not depth:
+                break
+            node = node.next
+
+
+BACKENDS = {
+    "html.parser": StdlibParser,
+    "lxml": LxmlParser,
+    "selectolax": SelectolaxParser,
+}
+
+_MODULES = {"lxml": "lxml", "selectolax": "selectolax"}
+
+
+@lru_cache(maxsize=None)
+def available_backends():
+    """
+    Installed backends, in PREFERENCE order.
+    """
+    return tuple(name for name in PREFERENCE
+                 if name not in _MODULES or importlib.util.find_spec(_MODULES[name]) is not None)
+
+
+def resolve_backend(name=None):
+    """
+    Pick a backend name. `name` (or AEO_PARSER) may be "auto", or a backend name;
+    an unknown or uninstalled backend falls back to html.parser.
+    """
+    name = name or os.environ.get("AEO_PARSER", "auto")
+    available = available_backends()
+    if name == "auto":
+        return available[0]
+    return name if name in available else "html.parser"
+
+
+def make_parser(handler, name=None):
+    return BACKENDS[resolve_backend(name)](handler)
@@ -0,0 +1,89 @@
+import json
+import os
+from functools import lru_cache
+
+from .rules import RULES
+
+PROFILES_PATH = os.environ.get("AEO_PROFILES_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles.json"))
+DEFAULT_PROFILE = "default"
+DEFAULT_WEIGHT = 10
+
+_RULES_BY_ID = {rule.id: rule for rule in RULES}
+
+
+class ProfileError(ValueError):
+    pass
+
+
+class ScoringPlan:
+    """
+    A profile compiled for the engine: the enabled rule classes (with threshold overrides
+    baked into subclasses) and their weights.
+    """
+
+    def __init__(self, name, rules, weights):
+        self.name = name
+        self.rules = rules
+        self.weights = weights
+        self.rule_ids = tuple(rule.id for rule in rules)
+
+
+def _is_number(value):
+    # JSON true/false load as bool, which Python counts as int
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def compile_profile(name, spec):
+    """
+    Profile spec (see profiles.json):
+    {"weights": {rule_id: points}, "disabled": [rule_id], "thresholds": {rule_id: {"min_chars": 800}}}.
+    Anything not mentioned keeps the built-in default (enabled, 10 points, stock thresholds).
+    """
+    weights = spec.get("weights", {})
+    disabled = set(spec.get("disabled", ()))
+    thresholds = spec.get("thresholds", {})
+    for rule_id in set(weights) | disabled | set(thresholds):
+        if rule_id not in _RULES_BY_ID:
+            raise ProfileError(f"Profile '{name}': unknown check '{rule_id}'.")
+    for rule_id, points in weights.items():
+        if not _is_number(points) or points < 0:
+            raise ProfileError(f"Profile '{name}': weight of '{rule_id}' must be a number >= 0, got {points!r}.")
+
+    rules = []
+    for rule_class in RULES:
+        if rule_class.id in disabled:
+            continue
+        overrides = {}
+        for key, value in thresholds.get(rule_class.id, {}).items():
+            attr = key.upper()
+            if not isinstance(getattr(rule_class, attr, None), (int, float)):
+                raise ProfileError(f"Profile '{name}': '{rule_class.id}' has no threshold '{key}'.")
+            if not _is_number(value):
+                raise ProfileError(f"Profile '{name}': threshold '{key}' of '{rule_class.id}' must be a number, got {value!r}.")
+            overrides[attr] = value
+        # Subclass only when something changes, so the stock classes are shared
+        rules.append(type(rule_class.__name__, (rule_class,), overrides) if overrides else rule_class)
+    if not rules:
+        raise ProfileError(f"Profile '{name}' disables every check.")
+    return ScoringPlan(name, rules, {rule.id: weights.get(rule.id, DEFAULT_WEIGHT) for rule in rules})
+
+
+@lru_cache(maxsize=None)
+def load_profiles(path=PROFILES_PATH):
+    """
+    Compile every profile in the config file once. A missing file means only "default".
+    """
+    specs = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            specs = json.load(f)
+    specs.setdefault(DEFAULT_PROFILE, {})
+    return {name: compile_profile(name, spec) for name, spec in specs.items()}
+
+
+def get_plan(name=None):
+    plans = load_profiles()
+    name = name or DEFAULT_PROFILE
+    if name not in plans:
+        raise ProfileError(f"Unknown profile '{name}'. Available: {', '.join(sorted(plans))}.")
+    return plans[name]
@@ -0,0 +1,274 @@
+import asyncio
+import os
+import time
+
+from .metrics import registry
+from .text import HIDDEN
+
+# Rendering is off unless a renderer is configured: "stub" (local files, for tests) or "playwright"
+RENDERER = os.environ.get("AEO_RENDERER", "")
+RENDER_POOL_SIZE = int(os.environ.get("AEO_RENDER_POOL", 2))
+RENDER_TIMEOUT = float(os.environ.get("AEO_RENDER_TIMEOUT", 15))
+
+# Mount points client-side frameworks render into
+ROOT_IDS = ("root", "app", "__next", "__nuxt", "___gatsby", "svelte", "main-app")
+ROOT_TAGS = ("app-root",)   # Angular
+# Attribute / script markers -> framework
+MARKERS = {"data-reactroot": "react", "ng-version": "angular", "data-v-app": "vue", "data-sveltekit": "svelte"}
+SCRIPT_MARKERS = (("__NEXT_DATA__", "next"), ("window.__NUXT__", "nuxt"), ("__remixContext", "remix"))
+# A page with less visible text than this can be a shell
+SHELL_MAX_TEXT = 200
+# ...when its inline scripts outweigh the text this many times over
+SCRIPT_TEXT_RATIO = 3
+
+RENDERS = registry.counter("aeo_renders_total", "Pages sent to the render stage.", labels=("outcome",))
+RENDER_SECONDS = registry.histogram("aeo_render_seconds", "Time to render a page in the render stage.")
+
+
+class ShellProbe:
+    """
+    Parser observer that spots client-rendered shells from the raw HTML: an empty mount
+    point (<div id="root"></div>), a "enable JavaScript" <noscript>, inline script text that
+    dwarfs the visible text, framework markers. Costs a few comparisons per event.
+    """
+
+    def __init__(self):
+        self.text_chars = 0
+        self.script_chars = 0
+        self.scripts = 0
+        self.empty_root = None
+        self.framework = None
+        self.js_required = False
+        self._hidden = 0
+        self._in_script = False
+        self._noscript = None   # text of the <noscript> being read
+        self._root = None   # mount point just opened, waiting to see if anything goes in it
+
+    def start(self, tag, attrs):
+        self._root = None   # anything inside the mount point means it is not empty
+        if tag == "script":
+            self.scripts += 1
+            self._in_script = True
+            if attrs.get("id") == "__NEXT_DATA__":
+                self.framework = "next"
+        elif tag == "noscript":
+            self._noscript = []
+        elif tag == "div" and attrs.get("id") in ROOT_IDS or tag in ROOT_TAGS:
+            self._root = attrs.get("id") or tag
+        if self.framework is None and attrs:
+            for attr, framework in MARKERS.items():
+                if attr in attrs:
+                    self.framework = framework
+                    break
+        if tag in HIDDEN:
+            self._hidden += 1
+
+    def end(self, tag):
+        if self._root is not None and self.empty_root is None:
+            self.empty_root = self._root
+        self._root = None
+        if tag == "script":
+            self._in_script = False
+        elif tag == "noscript" and self._noscript is not None:
+            if "javascript" in "".join(self._noscript).lower():
+                self.js_required = True
+            self._noscript = None
+        if tag in HIDDEN and self._hidden:
+            self._hidden -= 1
+
+    def data(self, data):
+        if self._in_script:
+            self.script_chars += len(data)
+            if self.framework is None:
+                for marker, framework in SCRIPT_MARKERS:
+                    if marker in data:
+                        self.framework = framework
+                        break
+            return
+        if self._noscript is not None and len(self._noscript) < 50:
+            self._noscript.append(data)
+        if self._hidden or data.isspace():
+            return
+        self._root = None
+        # Non-space characters: the same whatever way the parser split the text
+        self.text_chars += len("".join(data.split()))
+
+    def verdict(self):
+        """
+        {"shell": bool, "reasons": [...], "framework", "text_chars", "script_chars", "scripts"}.
+        """
+        reasons = []
+        if self.empty_root:
+            reasons.append(f"empty #{self.empty_root}")
+        if self.js_required:
+            reasons.append("noscript asks for JavaScript")
+        if self.scripts and self.script_chars > SCRIPT_TEXT_RATIO * max(self.text_chars, 1):
+            reasons.append("scripts outweigh text")
+        return {
+            "shell": self.text_chars < SHELL_MAX_TEXT and bool(reasons),
+            "reasons": reasons,
+            "framework": self.framework,
+            "text_chars": self.text_chars,
+            "script_chars": self.script_chars,
+            "scripts": self.scripts,
+        }
+
+
+class StubRenderer:
+    """
+    Renderer for tests and local runs: "renders" a URL by returning canned HTML from
+    `pages` (url -> html) or, failing that, the file named after the URL's last path
+    segment in `directory`. `delay` simulates render time.
+    """
+    name = "stub"
+
+    def __init__(self, pages=None, directory=None, delay=0.0):
+        self.pages = pages or {}
+        self.directory = directory
+        self.delay = delay
+        self.renders = 0
+
+    async def start(self):
+        pass
+
+    async def render(self, url, timeout):
+        self.renders += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if url in self.pages:
+            return self.pages[url]
+        if self.directory:
+            name = url.split("?", 1)[0].rstrip("/").rsplit("/", 1)[-1] or "index.html"
+            path = os.path.join(self.directory, name)
+            if os.path.isfile(path):
+                with open(path, encoding="utf-8") as f:
+                    return f.read()
+        raise LookupError(f"No rendered page for {url}")
+
+    async def close(self):
+        pass
+
+
+class PlaywrightRenderer:
+    """
+    Headless Chromium through Playwright (optional: `pip install playwright && playwright install chromium`).
+    One browser per renderer instance, a fresh context per page.
+    """
+    name = "playwright"
+
+    def __init__(self):
+        self._playwright = None
+        self._browser = None
+
+    async def start(self):
+        from playwright.async_api import async_playwright
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch()
+
+    async def render(self, url, timeout):
+        context = await self._browser.new_context()
+        try:
+            page = await context.new_page()
+            await page.goto(url, wait_until="networkidle", timeout=timeout * 1000)
+            return await page.content()
+        finally:
+            await context.close()
+
+    async def close(self):
+        if self._browser is not None:
+            await self._browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+
+
+class RenderPool:
+    """
+    Up to `size` warm renderer instances shared by all audits. Instances are started on
+    first use and handed back after each page, so a browser is launched once, not per URL.
+    `factory()` builds a renderer (start/render/close coroutines, see StubRenderer).
+    """
+
+    def __init__(self, factory, size=RENDER_POOL_SIZE, timeout=RENDER_TIMEOUT):
+        self.factory = factory
+        self.size = size
+        self.timeout = timeout
+        self.created = 0
+        self._idle = asyncio.Queue()
+        self._slots = asyncio.Semaphore(size)
+        self._all = []
+
+    async def render(self, url):
+        """
+        Rendered HTML of `url`. Raises whatever the renderer raised (timeouts included).
+        """
+        async with self._slots:
+            renderer = None if self._idle.empty() else self._idle.get_nowait()
+            try:
+                if renderer is None:
+                    renderer = self.factory()
+                    self._all.append(renderer)
+                    self.created += 1
+                    await renderer.start()
+                started = time.perf_counter()
+                html = await asyncio.wait_for(renderer.render(url, self.timeout), self.timeout + 5)
+            except BaseException as e:
+                # A renderer that failed, or was cancelled mid-page (client gone), may be wedged:
+                # close it (also when cancelled again meanwhile), the next page gets a fresh one
+                RENDERS.inc(outcome="cancelled" if isinstance(e, asyncio.CancelledError) else "error")
+                self._all.remove(renderer)
+                await asyncio.shield(renderer.close())
+                raise
+            RENDERS.inc(outcome="ok")
+            RENDER_SECONDS.observe(time.perf_counter() - started)
+            self._idle.put_nowait(renderer)
+            return html
+
+    async def close(self):
+        renderers, self._all = self._all, []
+        self._idle = asyncio.Queue()
+        for renderer in renderers:
+            await renderer.close()
+
+
+_pool = None
+
+
+class RendererError(ValueError):
+    pass
+
+
+def check_renderer():
+    """
+    Validate AEO_RENDERER at startup (a typo should not turn into failed audits later).
+    Raises RendererError for an unknown renderer or a missing optional dependency.
+    """
+    if RENDERER and RENDERER not in ("stub", "playwright"):
+        raise RendererError(f"Unknown AEO_RENDERER {RENDERER!r} (use 'stub' or 'playwright').")
+    if RENDERER == "playwright":
+        import importlib.util
+        if importlib.util.find_spec("playwright") is None:
+            raise RendererError("AEO_RENDERER=playwright needs `pip install playwright && playwright install chromium`.")
+
+
+def get_render_pool():
+    """
+    Process-wide render pool from AEO_RENDERER, or None when rendering is off.
+    AEO_RENDERER=stub renders from the files in AEO_RENDER_STUB_DIR.
+    """
+    global _pool
+    if _pool is None and RENDERER:
+        check_renderer()
+        if RENDERER == "playwright":
+            factory = PlaywrightRenderer
+        else:
+            directory = os.environ.get("AEO_RENDER_STUB_DIR")
+            factory = lambda: StubRenderer(directory=directory)  # noqa: E731
+        _pool = RenderPool(factory)
+    return _pool
+
+
+async def close_render_pool():
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+    _pool = None
@@ -0,0 +1,155 @@
+import re
+from urllib.parse import urlsplit
+
+from .metrics import RESPONSES
+
+# Google reads the first 500 KiB of a robots.txt; so do we
+MAX_ROBOTS_BYTES = 500 * 1024
+
+
+class RobotsPolicy:
+    """
+    Parsed robots.txt: user-agent groups (allow/disallow rules, crawl-delay) and Sitemap lines.
+    Matching follows Google's rules: the groups naming the crawler's product token apply (else "*"),
+    the longest matching path pattern wins, Allow wins a tie, `*` and `$` are supported.
+    to_dict()/from_dict() give a JSON form for the origin cache.
+    """
+
+    def __init__(self, groups=None, sitemaps=None):
+        # groups: [{"agents": [...], "rules": [(allow, pattern), ...], "crawl_delay": float or None}]
+        self.groups = groups or []
+        self.sitemaps = sitemaps or []
+        self._by_agent = {}
+        self._patterns = {}
+
+    @classmethod
+    def parse(cls, text):
+        groups = []
+        sitemaps = []
+        group = None
+        last_was_agent = False
+        for line in text.splitlines():
+            line = line.split("#", 1)[0].strip()
+            key, sep, value = line.partition(":")
+            if not sep:
+                continue
+            key = key.strip().lower()
+            value = value.strip()
+            if key == "user-agent":
+                # Consecutive User-agent lines share one group
+                if group is None or not last_was_agent:
+                    group = {"agents": [], "rules": [], "crawl_delay": None}
+                    groups.append(group)
+                group["agents"].append(value.lower())
+                last_was_agent = True
+                continue
+            last_was_agent = False
+            if key == "sitemap":
+                if value:
+                    sitemaps.append(value)
+            elif group is None:
+                continue
+            elif key in ("allow", "disallow"):
+                # An empty Disallow allows everything, i.e. it is no rule at all
+                if value:
+                    group["rules"].append((key == "allow", value))
+            elif key == "crawl-delay":
+                try:
+                    group["crawl_delay"] = float(value)
+                except ValueError:
+                    pass
+        return cls(groups, sitemaps)
+
+    def to_dict(self):
+        return {"groups": self.groups, "sitemaps": self.sitemaps}
+
+    @classmethod
+    def from_dict(cls, data):
+        groups = [{"agents": group["agents"], "rules": [tuple(rule) for rule in group["rules"]],
+                   "crawl_delay": group["crawl_delay"]} for group in data["groups"]]
+        return cls(groups, data["sitemaps"])
+
+    def _groups_for(self, agent):
+        cached = self._by_agent.get(agent)
+        if cached is not None:
+            return cached
+        # Product token, matched exactly (RFC 9309): "Googlebot/2.1" -> "googlebot". No substring
+        # match, and an empty User-agent line names nobody
+        token = agent.split("/", 1)[0].strip().lower()
+        chosen = []
+        if token and token != "*":
+            chosen = [group for group in self.groups if token in group["agents"]]
+        if not chosen:
+            chosen = [group for group in self.groups if "*" in group["agents"]]
+        self._by_agent[agent] = chosen
+        return chosen
+
+    def _matches(self, pattern, path):
+        matcher = self._patterns.get(pattern)
+        if matcher is None:
+            if "*" in pattern or pattern.endswith("$"):
+                anchored = pattern.endswith("$")
+                body = pattern[:-1] if anchored else pattern
+                regex = ".*".join(re.escape(part) for part in body.split("*")) + ("\\Z" if anchored else "")
+                matcher = re.compile(regex).match
+            else:
+                matcher = pattern
+            self._patterns[pattern] = matcher
+        if isinstance(matcher, str):
+            return path.startswith(matcher)
+        return matcher(path) is not None
+
+    def can_fetch(self, agent, url):
+        parts = urlsplit(url)
+        path = (parts.path or "/") + ("?" + parts.query if parts.query else "")
+        if path == "/robots.txt":
+            return True
+        verdict = True
+        longest = -1
+        for group in self._groups_for(agent):
+            for allow, pattern in group["rules"]:
+                if len(pattern) >= longest and self._matches(pattern, path):
+                    if len(pattern) > longest or allow:
+                        verdict = allow
+                    longest = len(pattern)
+        return verdict
+
+    def crawl_delay(self, agent):
+        for group in self._groups_for(agent):
+            if group["crawl_delay"] is not None:
+                return group["crawl_delay"]
+        return None
+
+    def summary(self):
+        """
+        Short form for the audit response.
+        """
+        return {
+            "user_agents": sorted({name for group in self.groups for name in group["agents"]}),
+            "rules": sum(len(group["rules"]) for group in self.groups),
+            "crawl_delay": self.crawl_delay("*"),
+            "sitemaps": self.sitemaps,
+        }
+
+
+async def fetch_robots(client, robots_url, timeout=5):
+    """
+    GET robots.txt (first MAX_ROBOTS_BYTES) and parse it.
+    Returns {"status": code or None if the request failed, "policy": RobotsPolicy.to_dict() or None}.
+    """
+    try:
+        async with client.stream("GET", robots_url, timeout=timeout) as response:
+            RESPONSES.inc(resource="robots", status=response.status_code)
+            if response.status_code != 200:
+                return {"status": response.status_code, "policy": None}
+            body = b""
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                if len(body) >= MAX_ROBOTS_BYTES:
+                    body = body[:MAX_ROBOTS_BYTES]
+                    break
+            policy = RobotsPolicy.parse(body.decode("utf-8", "replace"))
+            return {"status": 200, "policy": policy.to_dict()}
+    except Exception:
+        RESPONSES.inc(resource="robots", status="error")
+        return {"status": None, "policy": None}
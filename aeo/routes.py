@@ -0,0 +1,211 @@
+"""
+HTTP routes shared by the two apps: aeo_api.py mounts `router` at /, the Vercel function
+(api/index.py) at /api. Request models, response shaping and the rate limit live here too,
+so a fix lands in both. App-specific routes (jobs, snapshots, health) stay in the apps.
+"""
+import asyncio
+import json
+import time
+from typing import Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field, field_validator
+
+from .analyzer import analyze_aeo_async, iter_audit, origin_cache, result_cache
+from .catalog import catalog, catalog_etag, compact_event, compact_result
+from .crawl import crawl_site
+from .history import domain_of, get_history
+from .limits import Overloaded, client_key, limits_from_env
+from .metrics import render as render_metrics
+from .profiles import DEFAULT_PROFILE, get_plan, load_profiles
+
+# Per-client token buckets, and coalescing + per-origin caps for /audit (see aeo.limits)
+limiter, admission = limits_from_env()
+
+router = APIRouter()
+
+
+class AuditRequest(BaseModel):
+    url: str
+    no_cache: bool = False   # skip the result cache and re-audit from scratch
+    timings: bool = False    # include the per-phase "timings" block in the response
+    format: Literal["verbose", "compact"] = "verbose"   # compact: outcome codes, see GET /checks
+    profile: str = DEFAULT_PROFILE   # scoring profile, see GET /profiles
+
+    @field_validator("profile")
+    @classmethod
+    def known_profile(cls, value):
+        get_plan(value)   # ProfileError is a ValueError, so this becomes a 422
+        return value
+
+
+class CrawlRequest(BaseModel):
+    url: str
+    max_pages: int = Field(1000, ge=1, le=100000)
+    concurrency: int = Field(20, ge=1, le=200)
+    format: Literal["verbose", "compact"] = "verbose"
+    profile: str = DEFAULT_PROFILE
+
+    @field_validator("profile")
+    @classmethod
+    def known_profile(cls, value):
+        get_plan(value)
+        return value
+
+
+def shape_result(result, request):
+    # Timings are opt-in; copy instead of popping, the result may be shared with the cache
+    if request.format == "compact":
+        shaped = compact_result(result)
+        if request.timings and "timings" in result:
+            shaped["timings"] = result["timings"]
+        return shaped
+    if request.timings:
+        return result
+    return {key: value for key, value in result.items() if key != "timings"}
+
+
+def too_many(error):
+    print(f"🚦 Shedding load ({error.reason}), retry in {error.retry_after}s")
+    return HTTPException(status_code=429, detail=str(error), headers={"Retry-After": str(error.retry_after)})
+
+
+def check_rate(http_request):
+    try:
+        limiter.check(client_key(http_request))
+    except Overloaded as e:
+        raise too_many(e)
+
+
+@router.post("/audit")
+async def run_audit(request: AuditRequest, http_request: Request):
+    """
+    Audit the given URL for AEO readiness.
+    Identical audits already running are joined instead of repeated; 429 + Retry-After
+    when the client is over its rate or the target site / server is at capacity.
+    """
+    check_rate(http_request)
+    print(f"🔎 Auditing URL: {request.url}")
+    try:
+        result = await admission.run(request.url, (request.profile, request.no_cache), lambda: analyze_aeo_async(
+            request.url, use_cache=not request.no_cache, profile=request.profile))
+    except Overloaded as e:
+        raise too_many(e)
+    return shape_result(result, request)
+
+
+@router.post("/audit/stream")
+async def run_audit_stream(request: AuditRequest, http_request: Request, format: str = "ndjson"):
+    """
+    Same audit as /audit, streamed: one event per check as soon as it is decided,
+    then a final "score" event with the full result.
+    NDJSON by default; server-sent events with ?format=sse or Accept: text/event-stream.
+    """
+    check_rate(http_request)
+    sse = format == "sse" or "text/event-stream" in http_request.headers.get("accept", "")
+
+    async def events():
+        async for event in iter_audit(request.url, use_cache=not request.no_cache, profile=request.profile):
+            if event["type"] == "score":
+                event = {"type": "score", **shape_result(event, request)}
+            elif request.format == "compact":
+                event = compact_event(event)
+            data = json.dumps(event, ensure_ascii=False)
+            yield f"event: {event['type']}\ndata: {data}\n\n" if sse else data + "\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream" if sse else "application/x-ndjson")
+
+
+@router.post("/crawl")
+async def run_crawl(request: CrawlRequest, http_request: Request):
+    """
+    Audit a whole site from its sitemap.
+    Streams NDJSON: one line per page as it finishes, then a final site summary line.
+    """
+    check_rate(http_request)
+    print(f"🕸️ Crawling site: {request.url}")
+
+    async def lines():
+        async for event in crawl_site(request.url, request.max_pages, request.concurrency, profile=request.profile):
+            if request.format == "compact":
+                event = compact_event(event)
+            yield json.dumps(event, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+def _history():
+    store = get_history()
+    if store is None:
+        raise HTTPException(status_code=503, detail="Audit history is off (AEO_HISTORY_DB is empty).")
+    return store
+
+
+def _since(days):
+    return time.time() - days * 86400 if days else None
+
+
+@router.get("/history/{domain}/scores")
+async def score_history(domain: str, url: Optional[str] = None, profile: Optional[str] = None,
+                        days: int = Query(90, ge=0), bucket: Literal["hour", "day", "week"] = "day"):
+    """
+    Score over time for a domain (www. and subdomains included) or one of its URLs:
+    average / min / max per bucket over the last `days` (0 = all), plus the overall trend.
+    """
+    if url and not url.startswith("http"):
+        url = "https://" + url
+    return await asyncio.to_thread(_history().score_series, domain_of(domain), url, profile, _since(days), None, bucket)
+
+
+@router.get("/history/{domain}/regressions")
+async def check_regressions(domain: str, profile: Optional[str] = None, days: int = Query(30, ge=0)):
+    """
+    Per check, the domain's URLs that went from Pass to Fail (and back) over the last `days`.
+    """
+    return await asyncio.to_thread(_history().regressions, domain_of(domain), profile, _since(days))
+
+
+@router.get("/checks")
+def list_checks(http_request: Request):
+    """
+    The check catalog (ids, titles, outcome codes) that compact results refer to.
+    Static per deploy, so clients can cache it.
+    """
+    etag = catalog_etag()
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=86400"}
+    if http_request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(json.dumps(catalog(), ensure_ascii=False), media_type="application/json", headers=headers)
+
+
+@router.get("/profiles")
+def list_profiles():
+    """
+    Scoring profiles: enabled checks with their weights.
+    """
+    return {name: {"weights": plan.weights} for name, plan in load_profiles().items()}
+
+
+@router.get("/cache/stats")
+def cache_stats():
+    """
+    Hit/miss counters for the robots.txt / sitemap.xml origin cache and the page result cache.
+    """
+    return {"origin": origin_cache.stats(), "results": result_cache.stats()}
+
+
+@router.get("/limits")
+def limits_stats():
+    """
+    Admission control state: audits running, identical requests coalesced, origins busy.
+    """
+    return admission.stats()
+
+
+@router.get("/metrics")
+def metrics():
+    """
+    Audit latency, per-phase and per-check histograms in the Prometheus text format.
+    """
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
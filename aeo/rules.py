@@ -0,0 +1,451 @@
+import time
+from .links import classify_links
+from .parsers import make_parser
+from .structured import JsonLdIndex
+from .text import SAMPLE_CHARS, TAGS as TEXT_TAGS, TextStats
+
+# Registry of the checks, in report order. Use @register to add one.
+RULES = []
+
+
+def register(rule_class):
+    RULES.append(rule_class)
+    return rule_class
+
+
+class AuditContext:
+    """
+    Page-level facts shared by all rules of one audit.
+    The analyzer fills the robots.txt status and policy (aeo.robots.RobotsPolicy) and the
+    sitemap lookup (status, url, source "robots"/"root") once those fetches finish.
+    """
+
+    def __init__(self, url, base_domain):
+        self.url = url
+        self.base_domain = base_domain
+        self.robots_status = None
+        self.robots = None
+        self.sitemap_status = None
+        self.sitemap_url = None
+        self.sitemap_source = None
+
+
+class Rule:
+    """
+    One AEO check. The engine only sends a rule the events it subscribed to:
+    start()/end() for tags listed in `tags`, text() for every text node if `wants_text`.
+    finish() runs once after the document is done and returns a (status, icon, desc) outcome.
+
+    A rule whose outcome is settled early calls decide(outcome); the engine then stops
+    sending it events. `scope = "head"` rules look for <head> tags but, like BeautifulSoup's
+    find(), take a match anywhere: lxml and lexbor open an implied <body> at the first tag
+    <head> may not hold (<div id="fb-root">, <noscript><img>), and the tags after it still
+    count. They pass early and fail at the end of the document. "page" rules read fetch
+    results instead of the HTML.
+    A rule may set `details` (a plain dict) in finish(); it is reported with the result.
+    """
+    id = ""
+    title = ""
+    tags = ()
+    wants_text = False
+    scope = "body"
+    outcome = None
+    details = None
+
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.on_decided = None
+
+    def decide(self, outcome):
+        if self.outcome is None:
+            self.outcome = outcome
+            if self.on_decided is not None:
+                self.on_decided(self)
+
+    def start(self, tag, attrs):
+        pass
+
+    def end(self, tag):
+        pass
+
+    def text(self, data):
+        pass
+
+    def finish(self):
+        raise NotImplementedError
+
+
+# 1. Structure Data (JSON-LD)
+@register
+class StructuredData(Rule):
+    id = "json_ld"
+    title = "Structured Data (JSON-LD)"
+    tags = ("script",)
+    # Reads the JSON-LD text too, for the schema type index in details
+    wants_text = True
+    PASS = ("Pass", "✅", "Found. AI understands this content.")
+    FAIL = ("Fail", "❌", "Missing. Critical for AI understanding.")
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.index = JsonLdIndex()
+        self.in_block = False
+
+    def start(self, tag, attrs):
+        if attrs.get("type") == "application/ld+json":
+            self.index.open()
+            self.in_block = True
+
+    def end(self, tag):
+        if self.in_block:
+            self.index.close()
+            self.in_block = False
+
+    def text(self, data):
+        if self.in_block:
+            self.index.feed(data)
+
+    def finish(self):
+        self.index.close()
+        self.details = self.index.summary()
+        return self.PASS if self.index.blocks else self.FAIL
+
+
+# 2. Meta Description
+@register
+class MetaDescription(Rule):
+    id = "meta_description"
+    title = "Meta Description"
+    tags = ("meta",)
+    scope = "head"
+    PASS = ("Pass", "✅", "Good summary provided.")
+    FAIL = ("Fail", "❌", "Missing description.")
+
+    def start(self, tag, attrs):
+        # Only the first <meta name="description"> counts
+        if attrs.get("name") == "description":
+            self.decide(self.PASS if attrs.get("content") else self.FAIL)
+
+    def finish(self):
+        return self.FAIL
+
+
+# 3. Open Graph (Social/AI Context)
+@register
+class OpenGraph(Rule):
+    id = "open_graph"
+    title = "Open Graph Tags"
+    tags = ("meta",)
+    scope = "head"
+    PASS = ("Pass", "✅", "Social context present.")
+    FAIL = ("Fail", "❌", "Missing OpenGraph tags.")
+
+    def start(self, tag, attrs):
+        if attrs.get("property") == "og:title":
+            self.decide(self.PASS)
+
+    def finish(self):
+        return self.FAIL
+
+
+# 4. Header Hierarchy (H1/H2)
+@register
+class HeaderHierarchy(Rule):
+    id = "headers"
+    title = "Header Hierarchy (H1/H2)"
+    tags = ("h1", "h2")
+    PASS = ("Pass", "✅", "Clear content structure.")
+    FAIL = ("Fail", "❌", "Missing H1 or H2 tags.")
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.seen = set()
+
+    def start(self, tag, attrs):
+        self.seen.add(tag)
+        if len(self.seen) == 2:
+            self.decide(self.PASS)
+
+    def finish(self):
+        return self.FAIL
+
+
+# 5. Content Volume (> 500 chars)
+# Using characters as a proxy for words for simplicity in non-English
+@register
+class ContentVolume(Rule):
+    id = "content_volume"
+    title = "Content Volume"
+    # Visible text only (no script/style/noscript/svg...); block tags mark sentence and snippet ends
+    tags = TEXT_TAGS
+    wants_text = True
+    PASS = ("Pass", "✅", "Sufficient content depth.")
+    FAIL = ("Fail", "⚠️", "Too thin. Add more text.")
+    MIN_CHARS = 500
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        # Sample past MIN_CHARS, or a profile with a high min_chars could never fail
+        self.stats = TextStats(limit=max(SAMPLE_CHARS, self.MIN_CHARS + 1))
+
+    def start(self, tag, attrs):
+        self.stats.start(tag)
+
+    def end(self, tag):
+        self.stats.end(tag)
+
+    def text(self, data):
+        self.stats.text(data)
+        # Past MIN_CHARS with the text sample read (aeo.text.SAMPLE_CHARS): the rest cannot change anything
+        if self.stats.full and self.stats.chars > self.MIN_CHARS:
+            self.details = self.stats.summary()
+            self.decide(self.PASS)
+
+    def finish(self):
+        self.details = self.stats.summary()
+        return self.PASS if self.stats.chars > self.MIN_CHARS else self.FAIL
+
+
+# 6. Internal Links
+@register
+class InternalLinks(Rule):
+    id = "internal_links"
+    title = "Internal Linking"
+    tags = ("a",)
+    PASS = ("Pass", "✅", "Good internal connectivity.")
+    FAIL = ("Fail", "⚠️", "Few internal links found.")
+    MIN_LINKS = 3
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
+        self.hrefs = []
+
+    def start(self, tag, attrs):
+        # Just collect; finish() classifies the whole set at once (mega menus have thousands)
+        if "href" in attrs:
+            self.hrefs.append(attrs["href"])
+
+    def finish(self):
+        self.details = classify_links(self.ctx.url, self.hrefs)
+        return self.PASS if self.details["internal"] > self.MIN_LINKS else self.FAIL
+
+
+# 7. Image Alt Text
+@register
+class ImageAlt(Rule):
+    id = "image_alt"
+    title = "Image Alt Text"
+    tags = ("img",)
+    PASS = ("Pass", "✅", "Images have descriptions.")
+    PASS_NO_IMAGES = ("Pass", "✅", "No images to check.")
+    FAIL = ("Fail", "❌", "Many images missing Alt text.")
+    MIN_ALT_RATIO = 0.5
+
+    images = 0
+    with_alt = 0
+
+    def start(self, tag, attrs):
+        self.images += 1
+        if attrs.get("alt"):
+            self.with_alt += 1
+
+    def finish(self):
+        if not self.images:  # Pass if no images
+            return self.PASS_NO_IMAGES
+        return self.PASS if self.with_alt / self.images > self.MIN_ALT_RATIO else self.FAIL
+
+
+# 8. Mobile Viewport
+@register
+class MobileViewport(Rule):
+    id = "viewport"
+    title = "Mobile Friendly"
+    tags = ("meta",)
+    scope = "head"
+    PASS = ("Pass", "✅", "Mobile viewport tag found.")
+    FAIL = ("Fail", "❌", "Not optimized for mobile.")
+
+    def start(self, tag, attrs):
+        if attrs.get("name") == "viewport":
+            self.decide(self.PASS)
+
+    def finish(self):
+        return self.FAIL
+
+
+# 9. Robots.txt (fetched by the analyzer, not part of the HTML)
+@register
+class RobotsTxt(Rule):
+    id = "robots"
+    title = "Robots.txt"
+    scope = "page"
+    PASS = ("Pass", "✅", "Crawling policy found.")
+    FAIL = ("Fail", "⚠️", "Robots.txt unreachable.")
+    ERROR = ("Fail", "⚠️", "Check failed.")
+
+    def finish(self):
+        status = self.ctx.robots_status
+        if self.ctx.robots is not None:
+            self.details = dict(self.ctx.robots.summary(), allows_page=self.ctx.robots.can_fetch("*", self.ctx.url))
+        if status == 200:
+            return self.PASS
+        return self.FAIL if status is not None else self.ERROR
+
+
+# 10. Sitemap.xml
+@register
+class SitemapXml(Rule):
+    id = "sitemap"
+    title = "Sitemap.xml"
+    scope = "page"
+    PASS = ("Pass", "✅", "Sitemap found.")
+    # Looked up where robots.txt says first, then at the root
+    FAIL = ("Fail", "⚠️", "Sitemap not found in robots.txt or at root.")
+    ERROR = ("Fail", "⚠️", "Check failed.")
+
+    def finish(self):
+        status = self.ctx.sitemap_status
+        if status == 200:
+            self.details = {"url": self.ctx.sitemap_url, "source": self.ctx.sitemap_source}
+            return self.PASS
+        return self.FAIL if status is not None else self.ERROR
+
+
+class RuleEngine:
+    """
+    Runs every registered rule in a single streaming pass over the parser events.
+    No DOM is built: feed() chunks as they arrive, close(), then results().
+    `backend` picks the HTML parser (see aeo.parsers); default is the fastest installed one.
+    Once `done` is true every HTML rule has its outcome and the rest of the page can be skipped.
+    `on_result(index, item)` is called the moment each check is decided, for streaming.
+    Time spent inside each rule is reported by results() in milliseconds.
+    `weights` maps rule id -> points (default 10 each); the score is the passed share of 100.
+    `observer` (e.g. aeo.fingerprint.Fingerprinter), or a list of them, gets every parser event too.
+    """
+
+    def __init__(self, ctx, rules=None, backend=None, on_result=None, weights=None, observer=None):
+        self.rules = [rule_class(ctx) for rule_class in (rules if rules is not None else RULES)]
+        self.on_result = on_result
+        self.weights = weights or {}
+        if observer is None:
+            observer = ()
+        self.observers = tuple(observer) if isinstance(observer, (list, tuple)) else (observer,)
+        self._index = {rule.id: i for i, rule in enumerate(self.rules)}
+        self._elapsed = {rule.id: 0.0 for rule in self.rules}
+        self._by_tag = {}
+        for rule in self.rules:
+            rule.on_decided = self._decided
+            for tag in rule.tags:
+                self._by_tag[tag] = self._by_tag.get(tag, ()) + (rule,)
+        self._text_rules = tuple(rule for rule in self.rules if rule.wants_text)
+        self._pending = sum(1 for rule in self.rules if rule.scope != "page")
+        self.parser = make_parser(self, backend)
+
+    @property
+    def done(self):
+        return self._pending == 0
+
+    def feed(self, chunk):
+        self.parser.feed(chunk)
+
+    def close(self):
+        self.parser.close()
+
+    def _decided(self, rule):
+        # Stop routing events to a settled rule. Tuples are rebuilt, not mutated,
+        # so a dispatch loop that is running right now is not disturbed.
+        for tag in rule.tags:
+            self._by_tag[tag] = tuple(r for r in self._by_tag[tag] if r is not rule)
+        if rule.wants_text:
+            self._text_rules = tuple(r for r in self._text_rules if r is not rule)
+        if rule.scope != "page":
+            self._pending -= 1
+        if self.on_result is not None:
+            self.on_result(self._index[rule.id], self.item(rule))
+
+    def settle(self, rule):
+        """
+        Give an undecided rule its final outcome now (document finished, or its fetch came back).
+        """
+        if rule.outcome is None:
+            started = time.perf_counter()
+            outcome = rule.finish()
+            self._elapsed[rule.id] += time.perf_counter() - started
+            rule.decide(outcome)
+
+    def settle_html(self):
+        for rule in self.rules:
+            if rule.scope != "page":
+                self.settle(rule)
+
+    def settle_page(self, rule_id):
+        if rule_id in self._index:
+            self.settle(self.rules[self._index[rule_id]])
+
+    def apply(self, outcomes, elapsed, details=None):
+        """
+        Take HTML outcomes evaluated elsewhere (aeo.offload.evaluate_html in a worker process).
+        `outcomes` maps rule id -> (status, icon, desc), `elapsed` rule id -> seconds,
+        `details` rule id -> the rule's details dict.
+        """
+        details = details or {}
+        for rule_id, outcome in outcomes.items():
+            if rule_id in self._index:
+                rule = self.rules[self._index[rule_id]]
+                self._elapsed[rule_id] += elapsed.get(rule_id, 0.0)
+                if rule.outcome is None:
+                    rule.details = details.get(rule_id)
+                rule.decide(tuple(outcome))
+
+    @staticmethod
+    def item(rule):
+        status, icon, desc = rule.outcome
+        item = {"id": rule.id, "title": rule.title, "status": status, "icon": icon, "desc": desc}
+        if rule.details is not None:
+            item["details"] = rule.details
+        return item
+
+    # Parser callbacks
+
+    def start(self, tag, attrs):
+        for observer in self.observers:
+            observer.start(tag, attrs)
+        for rule in self._by_tag.get(tag, ()):
+            started = time.perf_counter()
+            rule.start(tag, attrs)
+            self._elapsed[rule.id] += time.perf_counter() - started
+
+    def end(self, tag):
+        for observer in self.observers:
+            observer.end(tag)
+        for rule in self._by_tag.get(tag, ()):
+            started = time.perf_counter()
+            rule.end(tag)
+            self._elapsed[rule.id] += time.perf_counter() - started
+
+    def data(self, data):
+        for observer in self.observers:
+            observer.data(data)
+        for rule in self._text_rules:
+            started = time.perf_counter()
+            rule.text(data)
+            self._elapsed[rule.id] += time.perf_counter() - started
+
+    def results(self):
+        """
+        Finish every rule. Returns (score, results, timings) in the analyze_aeo format.
+        """
+        earned = 0
+        total = 0
+        results = []
+        for rule in self.rules:
+            self.settle(rule)
+            item = self.item(rule)
+            weight = self.weights.get(rule.id, 10)
+            total += weight
+            if item["status"] == "Pass":
+                earned += weight
+            results.append(item)
+        score = round(100 * earned / total) if total else 0
+        timings = {rule_id: round(seconds * 1000, 3) for rule_id, seconds in self._elapsed.items()}
+        return score, results, timings
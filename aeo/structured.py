@@ -0,0 +1,195 @@
+import re
+
+try:
+    import orjson
+    loads = orjson.loads
+except ImportError:  # optional: `pip install orjson` for ~3x faster JSON-LD parsing
+    import json
+    loads = json.loads
+
+# One <script type="application/ld+json"> above this is not parsed, only scanned for @type
+MAX_BLOCK_CHARS = 1024 * 1024
+# Total JSON-LD parsed per page; blocks past it are scanned too
+MAX_PAGE_CHARS = 4 * 1024 * 1024
+# Nodes visited per page when walking parsed blocks
+MAX_NODES = 20000
+
+# Properties answer engines need per schema.org type. A tuple inside means "any one of".
+REQUIRED = {
+    "FAQPage": ("mainEntity",),
+    "Question": ("name", "acceptedAnswer"),
+    "HowTo": ("name", "step"),
+    "Article": ("headline", "author", "datePublished"),
+    "NewsArticle": ("headline", "author", "datePublished"),
+    "BlogPosting": ("headline", "author", "datePublished"),
+    "Product": ("name", ("offers", "review", "aggregateRating")),
+    "Recipe": ("name", "recipeIngredient"),
+    "Event": ("name", "startDate", "location"),
+    "Organization": ("name", "url"),
+    "LocalBusiness": ("name", "address"),
+    "BreadcrumbList": ("itemListElement",),
+}
+
+SCHEMA_PREFIXES = ("https://schema.org/", "http://schema.org/", "schema:")
+
+# "@type": "Product"  or  "@type": ["Product", "Thing"]
+TYPE_RE = re.compile(r'"@type"\s*:\s*(?:"([^"\\]{1,100})"|\[([^\]]{1,500})\])')
+TYPE_IN_LIST_RE = re.compile(r'"([^"\\]{1,100})"')
+# Longest text a TYPE_RE match can span; kept between chunks so a split match is still found
+SCAN_OVERLAP = 640
+
+
+def _type_names(value):
+    if isinstance(value, str):
+        value = (value,)
+    elif not isinstance(value, list):
+        return ()
+    names = []
+    for name in value:
+        if isinstance(name, str):
+            for prefix in SCHEMA_PREFIXES:
+                if name.startswith(prefix):
+                    name = name[len(prefix):]
+                    break
+            names.append(name)
+    return names
+
+
+def _has(node, prop):
+    if isinstance(prop, tuple):
+        return any(_has(node, p) for p in prop)
+    value = node.get(prop)
+    return value is not None and value != "" and value != []
+
+
+class JsonLdIndex:
+    """
+    Schema types and required-property coverage over every JSON-LD block of a page.
+    Blocks are fed as text arrives (open(), feed()..., close()); each one is parsed whole
+    unless it is over MAX_BLOCK_CHARS (or the page budget is spent), in which case it is
+    scanned chunk by chunk for "@type" values instead and never held in memory.
+    """
+
+    def __init__(self, max_block_chars=MAX_BLOCK_CHARS, max_page_chars=MAX_PAGE_CHARS):
+        self.max_block_chars = max_block_chars
+        self.budget = max_page_chars
+        self.blocks = 0
+        self.parsed = 0
+        self.errors = 0
+        self.oversized = 0
+        self.types = {}
+        self.coverage = {}
+        self._mode = None   # None, "buffer" or "scan"
+        self._parts = []
+        self._size = 0
+        self._tail = ""
+        self._nodes = 0
+
+    def open(self):
+        self.close()
+        self.blocks += 1
+        self._mode = "buffer"
+        self._parts = []
+        self._size = 0
+
+    def feed(self, text):
+        if self._mode == "buffer":
+            self._size += len(text)
+            if self._size <= self.max_block_chars and self._size <= self.budget:
+                self._parts.append(text)
+                return
+            # Too big to parse: switch to scanning, starting with what was buffered
+            self.oversized += 1
+            self._mode = "scan"
+            self._tail = ""
+            parts, self._parts = self._parts, []
+            for part in parts:
+                self._scan(part)
+        if self._mode == "scan":
+            self._scan(text)
+
+    def close(self):
+        if self._mode == "buffer":
+            text = "".join(self._parts)
+            self.budget -= len(text)
+            self.add(text)
+        self._mode = None
+        self._parts = []
+        self._tail = ""
+
+    def add(self, text):
+        """
+        Index one complete JSON-LD block.
+        """
+        text = text.strip()
+        # Old CMS templates wrap the JSON in an HTML comment or CDATA
+        if text.startswith("<!--"):
+            text = text[4:].rsplit("-->", 1)[0]
+        elif text.startswith("//<![CDATA["):
+            text = text[11:].rsplit("//]]>", 1)[0]
+        try:
+            data = loads(text)
+        except ValueError:
+            self.errors += 1
+            self._count_types(text, 0)
+            return
+        self.parsed += 1
+        self._walk(data)
+
+    def _walk(self, data):
+        # Iterative, bounded: @graph, nested entities (mainEntity -> Question -> acceptedAnswer) and lists
+        stack = [data]
+        while stack and self._nodes < MAX_NODES:
+            node = stack.pop()
+            if isinstance(node, list):
+                stack.extend(node)
+                continue
+            if not isinstance(node, dict):
+                continue
+            self._nodes += 1
+            for name in _type_names(node.get("@type")):
+                self.types[name] = self.types.get(name, 0) + 1
+                required = REQUIRED.get(name)
+                if required is not None:
+                    entry = self.coverage.setdefault(name, {"count": 0, "complete": 0, "missing": set()})
+                    entry["count"] += 1
+                    missing = [p if isinstance(p, str) else "|".join(p) for p in required if not _has(node, p)]
+                    if missing:
+                        entry["missing"].update(missing)
+                    else:
+                        entry["complete"] += 1
+            for value in node.values():
+                if isinstance(value, (dict, list)):
+                    stack.append(value)
+
+    def _scan(self, text):
+        # Matches ending inside the kept tail were counted with the previous chunk
+        buffer = self._tail + text
+        self._count_types(buffer, len(self._tail))
+        self._tail = buffer[-SCAN_OVERLAP:]
+
+    def _count_types(self, text, after):
+        for match in TYPE_RE.finditer(text):
+            if match.end() <= after:
+                continue
+            if match.group(1) is not None:
+                names = _type_names(match.group(1))
+            else:
+                names = _type_names(TYPE_IN_LIST_RE.findall(match.group(2)))
+            for name in names:
+                self.types[name] = self.types.get(name, 0) + 1
+
+    def summary(self):
+        """
+        Plain dict for the audit response.
+        """
+        return {
+            "blocks": self.blocks,
+            "parsed": self.parsed,
+            "errors": self.errors,
+            "oversized": self.oversized,
+            "types": dict(sorted(self.types.items(), key=lambda item: (-item[1], item[0]))),
+            "coverage": {name: {"count": entry["count"], "complete": entry["complete"],
+                                "missing": sorted(entry["missing"])}
+                         for name, entry in sorted(self.coverage.items())},
+        }
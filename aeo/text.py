@@ -0,0 +1,216 @@
+import re
+
+# Subtrees whose text is not page content: code, fallbacks, widgets, the <title>
+HIDDEN = ("script", "style", "template", "noscript", "svg", "title", "select", "textarea")
+HEADINGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+# Paragraph-like blocks that can stand alone as an answer snippet
+SNIPPET_BLOCKS = ("p", "li", "dd", "blockquote")
+# Tags that end a sentence even without punctuation (headings, list items, table cells...)
+BREAKS = SNIPPET_BLOCKS + HEADINGS + ("div", "section", "article", "td", "th", "tr", "br", "dt")
+# Every tag the extractor needs to see
+TAGS = HIDDEN + BREAKS
+
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+# A Han / kana character is a word on its own; other letters and digits form words in runs
+# (Korean is written with spaces, so a Hangul run is one eojeol)
+WORD = re.compile(f"[{_CJK}]|[^\\W_{_CJK}]+")
+# Latin terminators need a space (or the end) after them, "3.5" and "e.g" are not sentence ends
+SENTENCE_END = re.compile(r"[.!?…]+(?=\s|$)|[。！？]+")
+LATIN_TERMINATORS = ".!?…"
+TERMINATORS = frozenset(LATIN_TERMINATORS + "。！？")
+TRAILING_END = re.compile(r"[.!?…。！？][\W_]*$")
+_QUESTION_ENDINGS = ("?", "？", "까", "나요", "가요", "죠")
+
+# Answer snippets: standalone blocks of roughly 40-60 English words / 150-250 Korean characters
+SNIPPET_MIN_CHARS = 80
+SNIPPET_MAX_CHARS = 400
+MAX_SNIPPETS = 5
+# Words, sentences and snippets are read from this much visible text at most: the first
+# screens are what an answer engine quotes, the rest would only cost parse time
+SAMPLE_CHARS = 5000
+# Readability: words per sentence up to which text reads "easy" / "moderate", per script
+READABILITY = {"latin": (20, 30), "hangul": (12, 20), "cjk": (30, 50)}
+
+
+def _is_cjk(c):
+    return "\u3040" <= c <= "\u30ff" or "\u3400" <= c <= "\u4dbf" or "\u4e00" <= c <= "\u9fff" or "\uf900" <= c <= "\ufaff"
+
+
+def _has_hangul(token):
+    return any("\uac00" <= c <= "\ud7a3" for c in token)
+
+
+class TextStats:
+    """
+    Visible-text metrics from parser events, without building the page text:
+    chars (the content volume measure), words and sentences counted per script,
+    and answer-snippet candidates (paragraph blocks of answer length, preferring
+    those right after a question heading). Feed start()/end() for TAGS and text() for text.
+    Only the first `limit` visible characters are read; `full` tells when they are in.
+    """
+
+    def __init__(self, limit=SAMPLE_CHARS):
+        self.limit = limit
+        self.chars = 0
+        self.words = 0
+        self.sentences = 0
+        self.scripts = {"latin": 0, "hangul": 0, "cjk": 0}
+        self.snippets = []
+        self._hidden = 0
+        self._open = False      # words since the last sentence end
+        self._mid_word = False  # the last segment ended inside a word
+        self._space = False     # the last segment ended in whitespace
+        self._pending_end = False  # the last segment ended in ".", "!" or "?"
+        self._heading = None    # text of the heading being read, or the last one
+        self._in_heading = False
+        self._block = None      # segments of the snippet block being read
+        self._block_chars = 0
+
+    @property
+    def hidden(self):
+        return self._hidden > 0
+
+    @property
+    def full(self):
+        return self.chars >= self.limit
+
+    def start(self, tag, attrs=None):
+        if tag in HIDDEN:
+            self._hidden += 1
+            return
+        self._break()
+        if tag in HEADINGS:
+            self._heading = []
+            self._in_heading = True
+        elif tag in SNIPPET_BLOCKS:
+            self._block = []
+            self._block_chars = 0
+
+    def end(self, tag):
+        if tag in HIDDEN:
+            if self._hidden:
+                self._hidden -= 1
+            return
+        self._break()
+
+    def text(self, data):
+        # Empty segments (e.g. an empty CDATA section) carry nothing, and data[0] needs a character
+        if self._hidden or self.full or not data:
+            return
+        # Cut at the limit. Whitespace runs collapse, so the cut never overshoots it
+        # and the sample does not depend on how the text was split into segments
+        room = self.limit - self.chars
+        if len(data) > room:
+            data = data[:room]
+        if self._in_heading:
+            self._heading.append(data)
+        if self._block is not None and self._block_chars <= 2 * SNIPPET_MAX_CHARS:
+            self._block.append(data)
+            self._block_chars += len(data)
+        # Whitespace runs count as one character, also when a run spans text segments,
+        # so the count does not depend on how the parser or the network split the text
+        if self._pending_end:
+            # "3." + "5" was not a sentence end after all, "end." + " Next" was
+            self._pending_end = False
+            if data[0].isalnum():
+                self._open = True
+            elif data[0] not in LATIN_TERMINATORS:   # else "..." goes on and is counted below
+                self.sentences += 1
+        pieces = data.split()
+        if not pieces:
+            if not self._space:
+                self.chars += 1
+                self._space = True
+            self._mid_word = False
+            return
+        # Inner runs are the single spaces of the join; a leading one counts unless a run was open
+        chars = len(" ".join(pieces))
+        if data[0].isspace() and not self._space:
+            chars += 1
+        self._space = data[-1].isspace()
+        self.chars += chars + self._space
+
+        tokens = WORD.findall(data)
+        count = len(tokens)
+        if count:
+            # A word split across two text segments (chunk boundary) is still one word
+            if self._mid_word and data[0].isalnum() and not _is_cjk(data[0]):
+                self.words -= 1
+            self.words += count
+            if data.isascii():
+                self.scripts["latin"] += count
+            else:
+                # Classify the tokens already found instead of scanning the text again
+                cjk = hangul = 0
+                for token in tokens:
+                    if _is_cjk(token[0]):
+                        cjk += 1
+                    elif _has_hangul(token):
+                        hangul += 1
+                self.scripts["cjk"] += cjk
+                self.scripts["hangul"] += hangul
+                self.scripts["latin"] += count - cjk - hangul
+            self._mid_word = data[-1].isalnum() and not _is_cjk(data[-1])
+        else:
+            self._mid_word = False
+
+        ends = 0 if TERMINATORS.isdisjoint(data) else len(SENTENCE_END.findall(data))
+        if ends:
+            self.sentences += ends
+            # Words after the last terminator start the next sentence
+            self._open = TRAILING_END.search(data) is None
+            if data[-1] in LATIN_TERMINATORS:
+                # Terminator at the very end: the next segment decides
+                self.sentences -= 1
+                self._pending_end = True
+        elif count:
+            self._open = True
+
+    def _break(self):
+        # Block boundary: close the open sentence, the heading (<H1> is often left open) and the snippet block
+        self._mid_word = False
+        if self._in_heading:
+            self._in_heading = False
+            self._heading = " ".join("".join(self._heading).split())
+        if self._pending_end:
+            self._pending_end = False
+            self.sentences += 1
+        if self._open:
+            self.sentences += 1
+            self._open = False
+        if self._block is not None:
+            block, self._block = self._block, None
+            if self._block_chars >= SNIPPET_MIN_CHARS and len(self.snippets) < MAX_SNIPPETS * 4:
+                # Raw text is capped at twice the limit, so an over-long block stays over it
+                text = " ".join("".join(block).split())
+                if SNIPPET_MIN_CHARS <= len(text) <= SNIPPET_MAX_CHARS:
+                    heading = self._heading if isinstance(self._heading, str) else None
+                    self.snippets.append({
+                        "text": text,
+                        "heading": heading,
+                        "question": bool(heading) and heading.endswith(_QUESTION_ENDINGS),
+                    })
+
+    def summary(self):
+        """
+        Plain dict for the audit response.
+        """
+        self._break()
+        script = max(self.scripts, key=self.scripts.get) if self.words else None
+        per_sentence = round(self.words / max(self.sentences, 1), 1)
+        level = None
+        if script is not None:
+            easy, moderate = READABILITY[script]
+            level = "easy" if per_sentence <= easy else "moderate" if per_sentence <= moderate else "hard"
+        # Blocks under a question heading first, then page order
+        snippets = sorted(self.snippets, key=lambda snippet: not snippet["question"])[:MAX_SNIPPETS]
+        return {
+            # Sampled: the counts cover the first `limit` characters of a longer text
+            "sampled": self.full,
+            "chars": self.chars,
+            "words": self.words,
+            "sentences": self.sentences,
+            "script": script,
+            "readability": {"words_per_sentence": per_sentence, "level": level},
+            "snippets": snippets,
+        }
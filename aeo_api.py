@@ -1,10 +1,44 @@
-from fastapi import FastAPI
-from pydantic import BaseModel
-from aeo_analyzer import analyze_aeo
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import List, Literal
+from fastapi import FastAPI, HTTPException, Request
+from pydantic import BaseModel, Field, field_validator
+from aeo.history import start_history, stop_history
+from aeo.http import get_pool, close_pool
+from aeo.offload import shutdown_executor
+from aeo.profiles import DEFAULT_PROFILE, get_plan, load_profiles
+from aeo.render import check_renderer, close_render_pool
+from aeo.routes import AuditRequest, check_rate, router, shape_result
+from aeo_jobs import JobStore, JobWorkers
+from aeo_snapshots import SnapshotStore, reaudit
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
-app = FastAPI()
+# In-process job workers; set to 0 and run `python aeo_jobs.py` to scale workers separately
+JOB_WORKERS = int(os.environ.get("AEO_JOB_WORKERS", 4))
+
+@asynccontextmanager
+async def lifespan(app):
+    # One pooled HTTP client per process, reused by every audit
+    get_pool()
+    load_profiles()   # a broken profiles.json fails at startup, not on the first audit
+    check_renderer()  # so does an unknown AEO_RENDERER
+    start_history()
+    app.state.jobs = JobStore()
+    app.state.workers = JobWorkers(app.state.jobs, JOB_WORKERS)
+    app.state.workers.start()
+    app.state.snapshots = SnapshotStore()
+    yield
+    app.state.snapshots.close()
+    await app.state.workers.stop()
+    app.state.jobs.close()
+    stop_history()
+    await close_render_pool()
+    await close_pool()
+    shutdown_executor()
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,17 +48,60 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-class AuditRequest(BaseModel):
-    url: str
+# /audit, /audit/stream, /crawl, /history, /checks, /profiles, /cache/stats, /limits, /metrics (see aeo.routes)
+app.include_router(router)
+
+class BatchAuditRequest(BaseModel):
+    urls: List[str] = Field(..., min_length=1, max_length=10000)
+    no_cache: bool = False
+    profile: str = DEFAULT_PROFILE   # applies to every URL of the batch
+
+    @field_validator("profile")
+    @classmethod
+    def known_profile(cls, value):
+        get_plan(value)
+        return value
+
+@app.post("/audit/incremental")
+async def run_incremental_audit(request: AuditRequest, http_request: Request):
+    """
+    Audit against the URL's last snapshot: unchanged pages reuse the stored checks,
+    and the response carries a "changes" report (changed page parts, flipped checks, score delta).
+    """
+    check_rate(http_request)
+    print(f"🔁 Re-auditing URL: {request.url}")
+    result = await reaudit(request.url, app.state.snapshots, profile=request.profile)
+    return dict(shape_result(result, request), changes=result["changes"])
+
+@app.post("/audit/jobs")
+async def submit_audit_job(request: AuditRequest, http_request: Request):
+    """
+    Queue an audit and return right away with a job ID to poll.
+    """
+    check_rate(http_request)
+    job_id = await asyncio.to_thread(app.state.jobs.submit, [request.url], request.profile, request.no_cache)
+    app.state.workers.notify()
+    return {"id": job_id, "status_url": f"/audit/jobs/{job_id}"}
+
+@app.post("/audit/jobs/batch")
+async def submit_batch_job(request: BatchAuditRequest, http_request: Request):
+    """
+    Queue many URLs as one job. Poll it for partial results as pages finish.
+    """
+    check_rate(http_request)
+    job_id = await asyncio.to_thread(app.state.jobs.submit, request.urls, request.profile, request.no_cache)
+    app.state.workers.notify()
+    return {"id": job_id, "status_url": f"/audit/jobs/{job_id}"}
 
-@app.post("/audit")
-def run_audit(request: AuditRequest):
+@app.get("/audit/jobs/{job_id}")
+async def get_audit_job(job_id: str, format: Literal["verbose", "compact"] = "verbose"):
     """
-    Audit the given URL for AEO readiness.
+    Job status plus every result finished so far.
     """
-    print(f"🔎 Auditing URL: {request.url}")
-    result = analyze_aeo(request.url)
-    return result
+    job = await asyncio.to_thread(app.state.jobs.get, job_id, format == "compact")
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 @app.get("/")
 def health_check():
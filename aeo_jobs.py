@@ -0,0 +1,284 @@
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from aeo.analyzer import analyze_aeo_async
+from aeo.catalog import compact_result, expand_result
+from aeo.profiles import DEFAULT_PROFILE, ProfileError
+
+DB_PATH = os.environ.get("AEO_JOBS_DB", "aeo_jobs.db")
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF = 5          # seconds, doubled per attempt
+STALE_AFTER = 300          # a 'running' item older than this belongs to a dead worker
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    created REAL NOT NULL,
+    updated REAL NOT NULL,
+    profile TEXT NOT NULL DEFAULT 'default',
+    no_cache INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS items (
+    job_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    updated REAL NOT NULL,
+    result TEXT,
+    PRIMARY KEY (job_id, idx)
+);
+CREATE INDEX IF NOT EXISTS items_queue ON items (status, available_at);
+CREATE INDEX IF NOT EXISTS items_url ON items (url, status);
+"""
+# Columns added after the first release: (table, column, definition) for stores created before
+MIGRATIONS = (
+    ("jobs", "profile", "TEXT NOT NULL DEFAULT 'default'"),
+    ("jobs", "no_cache", "INTEGER NOT NULL DEFAULT 0"),
+)
+
+
+class JobStore:
+    """
+    SQLite job store shared by the API and any number of worker processes (WAL mode).
+    A job is a list of URLs ("items"); each item is queued -> running -> done / failed.
+    The job's scoring profile and no_cache flag apply to all of its items.
+    """
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(SCHEMA)
+            for table, column, definition in MIGRATIONS:
+                columns = {row["name"] for row in self._db.execute(f"PRAGMA table_info({table})")}
+                if column not in columns:
+                    self._db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    @contextmanager
+    def _transaction(self):
+        # BEGIN IMMEDIATE takes the write lock up front, so two workers never claim the same item
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._db
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def submit(self, urls, profile=DEFAULT_PROFILE, no_cache=False):
+        """
+        Queue a job and return its id. Duplicate URLs inside a batch are audited once.
+        A single URL that is already queued or running with the same settings returns the
+        existing job instead. `profile` and `no_cache` are passed on to analyze_aeo_async.
+        """
+        urls = list(dict.fromkeys(urls))
+        now = time.time()
+        with self._transaction() as db:
+            if len(urls) == 1:
+                row = db.execute(
+                    "SELECT job_id FROM items JOIN jobs ON jobs.id = items.job_id "
+                    "WHERE url = ? AND items.status IN ('queued', 'running') AND profile = ? AND no_cache = ? LIMIT 1",
+                    (urls[0], profile, int(no_cache))).fetchone()
+                if row:
+                    return row["job_id"]
+            job_id = uuid.uuid4().hex
+            db.execute("INSERT INTO jobs (id, status, created, updated, profile, no_cache) VALUES (?, 'queued', ?, ?, ?, ?)",
+                       (job_id, now, now, profile, int(no_cache)))
+            db.executemany(
+                "INSERT INTO items (job_id, idx, url, status, available_at, updated) VALUES (?, ?, ?, 'queued', ?, ?)",
+                [(job_id, i, url, now, now) for i, url in enumerate(urls)])
+            return job_id
+
+    def claim(self, limit):
+        """
+        Atomically take up to `limit` queued items for this worker, with their job's settings.
+        """
+        now = time.time()
+        with self._transaction() as db:
+            rows = db.execute(
+                """UPDATE items SET status = 'running', attempts = attempts + 1, updated = ?
+                   WHERE rowid IN (SELECT rowid FROM items WHERE status = 'queued' AND available_at <= ?
+                                   ORDER BY available_at LIMIT ?)
+                   RETURNING job_id, idx, url, attempts""", (now, now, limit)).fetchall()
+            job_ids = {row["job_id"] for row in rows}
+            db.executemany("UPDATE jobs SET status = 'running', updated = ? WHERE id = ? AND status = 'queued'",
+                           [(now, job_id) for job_id in job_ids])
+            settings = {}
+            for job_id in job_ids:
+                job = db.execute("SELECT profile, no_cache FROM jobs WHERE id = ?", (job_id,)).fetchone()
+                settings[job_id] = {"profile": job["profile"], "no_cache": bool(job["no_cache"])}
+        return [dict(row, **settings[row["job_id"]]) for row in rows]
+
+    def finish(self, item, result, retryable=True):
+        """
+        Store an item's result (in the compact form, see aeo.catalog). Failed audits are
+        retried with backoff up to MAX_ATTEMPTS (unless not `retryable`); after that the
+        error result is kept.
+        """
+        now = time.time()
+        retry = retryable and "error" in result and item["attempts"] < MAX_ATTEMPTS
+        with self._transaction() as db:
+            if retry:
+                db.execute(
+                    "UPDATE items SET status = 'queued', available_at = ?, updated = ? WHERE job_id = ? AND idx = ?",
+                    (now + RETRY_BACKOFF * 2 ** (item["attempts"] - 1), now, item["job_id"], item["idx"]))
+            else:
+                db.execute(
+                    "UPDATE items SET status = ?, result = ?, updated = ? WHERE job_id = ? AND idx = ?",
+                    ("failed" if "error" in result else "done", json.dumps(compact_result(result), ensure_ascii=False), now,
+                     item["job_id"], item["idx"]))
+                open_items = db.execute(
+                    "SELECT COUNT(*) FROM items WHERE job_id = ? AND status IN ('queued', 'running')",
+                    (item["job_id"],)).fetchone()[0]
+                if not open_items:
+                    db.execute("UPDATE jobs SET status = 'done', updated = ? WHERE id = ?", (now, item["job_id"]))
+
+    def requeue_stale(self, older_than=STALE_AFTER):
+        """
+        Put back items left 'running' by a worker that died. Returns how many.
+        """
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE items SET status = 'queued' WHERE status = 'running' AND updated < ?",
+                (time.time() - older_than,))
+            return cursor.rowcount
+
+    def get(self, job_id, compact=False):
+        """
+        Job status with the results finished so far (partial while the job runs), or None.
+        Results are expanded to the verbose layout unless `compact` is set.
+        """
+        with self._lock:
+            job = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if job is None:
+                return None
+            items = self._db.execute(
+                "SELECT url, status, attempts, result FROM items WHERE job_id = ? ORDER BY idx", (job_id,)).fetchall()
+        shape = (lambda result: result) if compact else expand_result
+        counts = {}
+        for item in items:
+            counts[item["status"]] = counts.get(item["status"], 0) + 1
+        return {
+            "id": job["id"],
+            "status": job["status"],
+            "profile": job["profile"],
+            "no_cache": bool(job["no_cache"]),
+            "created": job["created"],
+            "updated": job["updated"],
+            "total": len(items),
+            "counts": counts,
+            "results": [
+                {"url": item["url"], "status": item["status"], "attempts": item["attempts"],
+                 "result": shape(json.loads(item["result"])) if item["result"] else None}
+                for item in items
+            ],
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class JobWorkers:
+    """
+    Pool of `concurrency` async workers pulling audits from a JobStore.
+    Run it inside the API process, or on its own with `python aeo_jobs.py`.
+    """
+
+    def __init__(self, store, concurrency=4, poll_interval=0.5):
+        self.store = store
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.wakeup = asyncio.Event()
+        self._tasks = []
+
+    def start(self):
+        self.store.requeue_stale()
+        self._tasks = [asyncio.ensure_future(self._run()) for _ in range(self.concurrency)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self):
+        """
+        Wake idle workers right away (call after submitting in the same process).
+        """
+        self.wakeup.set()
+
+    async def _run(self):
+        # One bad item or a locked database must not end the worker: it would leave its item
+        # 'running' and the pool one worker short until restart
+        while True:
+            try:
+                items = await asyncio.to_thread(self.store.claim, 1)
+            except Exception as e:
+                print(f"⚠️ Job worker could not claim an item: {e}")
+                await asyncio.sleep(self.poll_interval)
+                continue
+            if not items:
+                self.wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            item = items[0]
+            retryable = True
+            try:
+                result = await analyze_aeo_async(item["url"], profile=item["profile"], use_cache=not item["no_cache"])
+            except Exception as e:
+                # e.g. the job's profile was removed from profiles.json since it was queued
+                retryable = not isinstance(e, ProfileError)
+                result = {"score": 0, "url": item["url"], "error": str(e),
+                          "results": [{"title": "Analysis Failed", "status": "Fail", "icon": "❌", "desc": str(e)}]}
+            await self._finish(item, result, retryable)
+
+    async def _finish(self, item, result, retryable):
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                await asyncio.to_thread(self.store.finish, item, result, retryable)
+                return
+            except Exception as e:
+                print(f"⚠️ Could not store the result for {item['url']}: {e}")
+                await asyncio.sleep(self.poll_interval * 2 ** attempt)
+        # Still 'running': requeue_stale() hands it out again on the next start
+
+
+async def _serve(path, concurrency):
+    store = JobStore(path)
+    workers = JobWorkers(store, concurrency)
+    workers.start()
+    print(f"👷 {concurrency} audit workers on {path}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await workers.stop()
+        store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run AEO audit workers against the job store.")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args.db, args.workers))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,176 @@
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from aeo.analyzer import analyze_aeo_async
+from aeo.catalog import catalog, compact_result, expand_result
+from aeo.fingerprint import FACETS
+from aeo.http import get_pool, normalize_url
+from aeo.profiles import DEFAULT_PROFILE
+
+DB_PATH = os.environ.get("AEO_SNAPSHOTS_DB", "aeo_snapshots.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    body_hash TEXT,
+    fingerprints TEXT NOT NULL,
+    result TEXT NOT NULL,
+    audited REAL NOT NULL,
+    checked REAL NOT NULL
+);
+"""
+
+
+class SnapshotStore:
+    """
+    Last audit of each URL (per scoring profile): the page validators, body hash,
+    structural fingerprints and compact check results. SQLite in WAL mode, like the job store.
+    """
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(SCHEMA)
+
+    def get(self, key):
+        with self._lock:
+            row = self._db.execute("SELECT * FROM snapshots WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        snapshot = dict(row)
+        snapshot["fingerprints"] = json.loads(snapshot["fingerprints"])
+        snapshot["result"] = json.loads(snapshot["result"])
+        return snapshot
+
+    def put(self, key, result):
+        """
+        Store a fresh audit (it must carry fingerprints, see analyze_aeo_async(fingerprint=True)).
+        """
+        now = time.time()
+        fetch = result["fetch"]
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, result["url"], fetch.get("etag"), fetch.get("last_modified"),
+                 None if fetch["stopped_early"] else fetch["body_hash"],
+                 json.dumps(result["fingerprints"]), json.dumps(compact_result(result), ensure_ascii=False), now, now))
+
+    def touch(self, key, result):
+        """
+        The page was unchanged: keep its fingerprints and hash, refresh the validators, the check
+        time and the stored checks (robots.txt and the sitemap are re-checked on every audit).
+        """
+        fetch = result["fetch"]
+        with self._lock:
+            self._db.execute(
+                "UPDATE snapshots SET etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified), "
+                "result = ?, checked = ? WHERE key = ?",
+                (fetch.get("etag"), fetch.get("last_modified"), json.dumps(compact_result(result), ensure_ascii=False),
+                 time.time(), key))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def snapshot_key(url, profile=None):
+    if not url.startswith("http"):
+        url = "https://" + url
+    return normalize_url(url) + "#" + (profile or DEFAULT_PROFILE)
+
+
+def _statuses(compact):
+    # catalog position -> "Pass"/"Fail"/None for a compact result
+    checks = catalog()["checks"]
+    codes = compact.get("codes") or [None] * len(checks)
+    return [None if code is None else check["outcomes"][code]["status"] for check, code in zip(checks, codes)]
+
+
+def change_report(previous, result, fingerprints):
+    """
+    What changed since the previous snapshot: which page parts (fingerprint facets),
+    which checks flipped, and the score delta.
+    """
+    if previous is None:
+        return {"status": "new", "previous_audit": None, "facets_changed": [], "checks_changed": [],
+                "score": {"before": None, "after": result["score"], "delta": None}}
+    status = result.get("cache") if result.get("cache") in ("not_modified", "unchanged") else "changed"
+    facets = [facet for facet in FACETS if previous["fingerprints"].get(facet) != fingerprints.get(facet)]
+    checks_changed = []
+    for check, before, after in zip(catalog()["checks"], _statuses(previous["result"]),
+                                    _statuses(compact_result(result))):
+        if before != after:
+            checks_changed.append({"id": check["id"], "title": check["title"], "before": before, "after": after})
+    before_score = previous["result"]["score"]
+    return {
+        "status": status,
+        "previous_audit": previous["audited"],
+        "facets_changed": facets,
+        "checks_changed": checks_changed,
+        "score": {"before": before_score, "after": result["score"], "delta": result["score"] - before_score},
+    }
+
+
+async def reaudit(url, store, client=None, profile=None):
+    """
+    Audit `url` against its last snapshot. An unchanged page (304 or same body hash) reuses
+    the stored page checks without parsing (robots.txt and the sitemap are checked fresh); a changed one is audited in one pass that also
+    fingerprints it. Returns the analyze_aeo result plus a "changes" report.
+    """
+    key = snapshot_key(url, profile)
+    previous = await asyncio.to_thread(store.get, key)
+    baseline = None
+    if previous is not None:
+        baseline = {"etag": previous["etag"], "last_modified": previous["last_modified"],
+                    "body_hash": previous["body_hash"],
+                    "result": dict(expand_result(previous["result"]), fingerprints=previous["fingerprints"])}
+
+    result = await analyze_aeo_async(url, client, use_cache=False, profile=profile, baseline=baseline, fingerprint=True)
+    if "error" in result:
+        # Keep the last good snapshot; a flaky fetch is not a change
+        return dict(result, changes=None)
+
+    if result.get("cache") in ("not_modified", "unchanged"):
+        await asyncio.to_thread(store.touch, key, result)
+    else:
+        await asyncio.to_thread(store.put, key, result)
+    return dict(result, changes=change_report(previous, result, result["fingerprints"]))
+
+
+async def _run(path, urls, concurrency, profile):
+    store = SnapshotStore(path)
+    semaphore = asyncio.Semaphore(concurrency)
+    client = get_pool()
+
+    async def one(url):
+        async with semaphore:
+            result = await reaudit(url, store, client, profile)
+        print(json.dumps({"url": result["url"], "score": result["score"], "changes": result["changes"]},
+                         ensure_ascii=False))
+
+    try:
+        await asyncio.gather(*(one(url) for url in urls))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-audit URLs against their last snapshots and print what changed.")
+    parser.add_argument("urls", nargs="+")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--profile", default=DEFAULT_PROFILE)
+    args = parser.parse_args()
+    asyncio.run(_run(args.db, args.urls, args.concurrency, args.profile))
@@ -1,10 +1,33 @@
+import os
+import sys
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from pydantic import BaseModel
 from fastapi.middleware.cors import CORSMiddleware
-# Since Vercel runs this file, and aeo_analyzer is in the same dir
-from .aeo_analyzer import analyze_aeo
+# Vercel runs this file from api/; the shared aeo package sits one level up
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Vercel's edge sets X-Forwarded-For to the real client address: key the rate limit on it
+os.environ.setdefault("AEO_TRUST_FORWARDED", "1")
+from aeo.history import start_history, stop_history
+from aeo.http import close_pool
+from aeo.offload import shutdown_executor
+from aeo.profiles import load_profiles
+from aeo.render import check_renderer, close_render_pool
+from aeo.routes import router
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app):
+    # No get_pool() here: the HTTP client (and httpx) load with the first audit, not on every cold start
+    load_profiles()   # a broken profiles.json fails at startup, not on the first audit
+    check_renderer()  # so does an unknown AEO_RENDERER
+    # /tmp is the only writable dir on Vercel, so history lasts as long as the instance
+    start_history(os.environ.get("AEO_HISTORY_DB", "/tmp/aeo_history.db"))
+    yield
+    stop_history()
+    await close_render_pool()
+    await close_pool()
+    shutdown_executor()
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,14 +37,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-class AuditRequest(BaseModel):
-    url: str
+# Same routes as aeo_api.py (see aeo.routes), under /api
+app.include_router(router, prefix="/api")
 
 @app.get("/api/health")
 def health_check():
     return {"status": "ok"}
-
-@app.post("/api/audit")
-def run_audit(request: AuditRequest):
-    result = analyze_aeo(request.url)
-    return result
@@ -0,0 +1,190 @@
+import argparse
+import gzip
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Page size classes in the generated corpus: (name, approx body bytes, pages)
+SIZES = (("small", 4 * 1024, 20), ("median", 60 * 1024, 20), ("large", 3 * 1024 * 1024, 3))
+
+# robots.txt / sitemap combinations a site can be served with
+VARIANTS = {
+    "full": {"robots": True, "sitemap": "xml"},
+    "gzip-sitemap": {"robots": True, "sitemap": "gz"},
+    "no-sitemap": {"robots": True, "sitemap": None},
+    "bare": {"robots": False, "sitemap": None},
+}
+
+WORDS = ("answer engine optimization search structured data content page users question "
+         "guide product service review price delivery support team about contact 서비스 검색 "
+         "최적화 콘텐츠").split()
+
+
+def _sentence(rng):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(8, 20))]
+    return " ".join(words).capitalize() + "."
+
+
+def make_page(rng, size, name):
+    """
+    One HTML page of about `size` bytes that exercises every check: head metadata,
+    JSON-LD, headings, paragraphs, internal/external links and images (some without alt).
+    """
+    head = (f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>{name}</title>"
+            f"<meta name=\"description\" content=\"{_sentence(rng)}\">"
+            f"<meta property=\"og:title\" content=\"{name}\">"
+            "<meta name=\"viewport\" content=\"width=device-width, initial-scale=1\">"
+            "<script type=\"application/ld+json\">{\"@context\": \"https://schema.org\", "
+            f"\"@type\": \"Article\", \"headline\": \"{name}\"}}</script>"
+            "<style>body { font-family: sans-serif; }</style></head><body>")
+    parts = [head, f"<h1>{name}</h1>"]
+    length = len(head)
+    section = 0
+    while length < size:
+        section += 1
+        block = [f"<h2>Section {section}</h2>"]
+        for _ in range(rng.randint(2, 5)):
+            block.append(f"<p>{' '.join(_sentence(rng) for _ in range(rng.randint(2, 6)))}</p>")
+        block.append(f"<a href=\"/pages/small-{rng.randrange(20)}.html\">more</a>")
+        block.append(f"<a href=\"https://example.org/{section}\">ref</a>")
+        alt = f" alt=\"figure {section}\"" if rng.random() < 0.7 else ""
+        block.append(f"<img src=\"/img/{section}.png\"{alt}>")
+        text = "".join(block)
+        parts.append(text)
+        length += len(text.encode("utf-8"))
+    parts.append("</body></html>")
+    return "".join(parts).encode("utf-8")
+
+
+def build_corpus(seed=42):
+    """
+    Deterministic corpus: {"/pages/<size>-<n>.html": bytes}. Same seed, same bytes.
+    """
+    rng = random.Random(seed)
+    corpus = {}
+    for size_name, size, count in SIZES:
+        for n in range(count):
+            path = f"/pages/{size_name}-{n}.html"
+            corpus[path] = make_page(rng, size, f"{size_name} page {n}")
+    return corpus
+
+
+def page_paths(corpus, size_name):
+    return sorted(path for path in corpus if path.startswith(f"/pages/{size_name}-"))
+
+
+def _sitemap(base_url, paths):
+    urls = "".join(f"<url><loc>{base_url}{path}</loc></url>" for path in paths)
+    return f"<?xml version=\"1.0\" encoding=\"UTF-8\"?><urlset xmlns=\"http://www.sitemaps.org/schemas/sitemap/0.9\">{urls}</urlset>".encode()
+
+
+class FixtureServer:
+    """
+    Threaded HTTP server for one fixture site.
+    `latency` (seconds, +/- `jitter` fraction) is added before every response;
+    `fail_rate` of requests get a 500 and `drop_rate` have their connection closed with no response.
+    """
+
+    def __init__(self, corpus, variant="full", latency=0.0, jitter=0.2, fail_rate=0.0, drop_rate=0.0,
+                 port=0, seed=42):
+        self.corpus = corpus
+        self.variant = VARIANTS[variant]
+        self.latency = latency
+        self.jitter = jitter
+        self.fail_rate = fail_rate
+        self.drop_rate = drop_rate
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread = None
+
+    def _extra(self, path):
+        sitemap = self.variant["sitemap"]
+        if path == "/robots.txt" and self.variant["robots"]:
+            lines = ["User-agent: *", "Disallow: /private"]
+            if sitemap == "gz":
+                lines.append(f"Sitemap: {self.base_url}/sitemap.xml.gz")
+            return "\n".join(lines).encode(), "text/plain"
+        if path == "/sitemap.xml" and sitemap == "xml":
+            return _sitemap(self.base_url, sorted(self.corpus)), "application/xml"
+        if path == "/sitemap.xml.gz" and sitemap == "gz":
+            return gzip.compress(_sitemap(self.base_url, sorted(self.corpus))), "application/gzip"
+        return None, None
+
+    def _roll(self):
+        with self._lock:
+            self.requests += 1
+            delay = self.latency * (1 + self._rng.uniform(-self.jitter, self.jitter)) if self.latency else 0
+            roll = self._rng.random()
+        return delay, roll
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes; without this, delayed ACKs add ~40 ms per response
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                delay, roll = server._roll()
+                if delay:
+                    time.sleep(delay)
+                if roll < server.drop_rate:
+                    self.close_connection = True
+                    self.connection.close()
+                    return
+                if roll < server.drop_rate + server.fail_rate:
+                    self._send(500, b"injected failure", "text/plain")
+                    return
+                path = self.path.split("?", 1)[0]
+                body = server.corpus.get(path)
+                content_type = "text/html; charset=utf-8"
+                if body is None:
+                    body, content_type = server._extra(path)
+                if body is None:
+                    self._send(404, b"not found", "text/plain")
+                else:
+                    self._send(200, body, content_type)
+
+            def _send(self, status, body, content_type):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the benchmark fixture corpus.")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--variant", choices=sorted(VARIANTS), default="full")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests answered with 500")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="fraction of connections closed without a response")
+    args = parser.parse_args()
+    server = FixtureServer(build_corpus(), args.variant, args.latency, fail_rate=args.fail_rate,
+                           drop_rate=args.drop_rate, port=args.port)
+    print(f"📦 Serving {len(server.corpus)} pages at {server.base_url} ({args.variant})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,250 @@
+"""
+Benchmark the audit pipeline against a local fixture site (benchmarks/fixture_server.py).
+
+    python benchmarks/run_bench.py                         # writes benchmarks/results/<commit>.json
+    python benchmarks/run_bench.py --latency 0.05 --fail-rate 0.02 --requests 200
+    python benchmarks/run_bench.py --compare benchmarks/results/<old>.json
+
+Every scenario audits pages of one size class through one entry point:
+"analyze" (analyze_aeo_async), "api" (POST /audit) or "stream" (POST /audit/stream),
+the API ones in-process through httpx's ASGI transport. The result cache is bypassed, and so
+are the API's rate limit and per-origin cap.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import httpx  # noqa: E402
+
+from benchmarks.fixture_server import FixtureServer, build_corpus, page_paths  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+# (scenario name, size class, site variant, entry point)
+SCENARIOS = (
+    ("analyze-small", "small", "full", "analyze"),
+    ("analyze-median", "median", "full", "analyze"),
+    ("analyze-large", "large", "full", "analyze"),
+    ("analyze-gzip-sitemap", "median", "gzip-sitemap", "analyze"),
+    ("analyze-bare-site", "median", "bare", "analyze"),
+    ("api-audit-median", "median", "full", "api"),
+    ("api-stream-median", "median", "full", "stream"),
+)
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    k = (len(values) - 1) * p / 100
+    low = int(k)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (k - low)
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+async def _audit_direct(client, url):
+    from aeo.analyzer import analyze_aeo_async
+    return await analyze_aeo_async(url, client, use_cache=False)
+
+
+def _api_runner(entry):
+    from aeo_api import app
+    transport = httpx.ASGITransport(app=app)
+    api = httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60)
+
+    async def run(client, url):
+        # Anything but a 200 (429, 503...) counts as an error, not a result
+        if entry == "api":
+            response = await api.post("/audit", json={"url": url, "no_cache": True, "timings": True})
+            return response.json() if response.status_code == 200 else None
+        result = None
+        async with api.stream("POST", "/audit/stream", json={"url": url, "no_cache": True, "timings": True}) as response:
+            if response.status_code != 200:
+                return None
+            async for line in response.aiter_lines():
+                if line:
+                    event = json.loads(line)
+                    if event["type"] == "score":
+                        result = event
+        return result
+
+    return run, api
+
+
+async def run_scenario(name, size, variant, entry, corpus, args):
+    from aeo.analyzer import origin_cache
+    from aeo.cache import MemoryBackend
+    from aeo.http import HttpPool
+
+    server = FixtureServer(corpus, variant, args.latency, fail_rate=args.fail_rate,
+                           drop_rate=args.drop_rate, seed=args.seed).start()
+    paths = page_paths(corpus, size)
+    urls = [server.base_url + paths[i % len(paths)] for i in range(args.requests)]
+    api = None
+    if entry == "analyze":
+        audit = _audit_direct
+    else:
+        audit, api = _api_runner(entry)
+
+    latencies = []
+    errors = 0
+    bytes_read = 0
+    parse_ms = []
+    rule_ms = {}
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(client, url):
+        nonlocal errors, bytes_read
+        if args.cold_origin:
+            origin_cache.backend = MemoryBackend()
+        async with semaphore:
+            started = time.perf_counter()
+            result = await audit(client, url)
+            latencies.append((time.perf_counter() - started) * 1000)
+        if not result or "error" in result:
+            errors += 1
+            return
+        bytes_read += result["fetch"]["bytes"]
+        parse_ms.append(result["timings"]["parse"])
+        for rule_id, ms in result["timings"]["rules"].items():
+            rule_ms.setdefault(rule_id, []).append(ms)
+
+    try:
+        async with HttpPool() as client:
+            # Warm up connections and the origin cache so the first scenario is not penalized
+            await audit(client, urls[0])
+            origin_cache.backend = MemoryBackend()
+            cpu_started = time.process_time()
+            started = time.perf_counter()
+            await asyncio.gather(*(one(client, url) for url in urls))
+            wall = time.perf_counter() - started
+            cpu = time.process_time() - cpu_started
+    finally:
+        if api is not None:
+            await api.aclose()
+        server.stop()
+
+    def ms(value):
+        return round(value, 3) if value is not None else None
+
+    return {
+        "scenario": name,
+        "size": size,
+        "variant": variant,
+        "entry": entry,
+        "requests": len(urls),
+        "errors": errors,
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(len(urls) / wall, 2) if wall else None,
+        "latency_ms": {
+            "p50": ms(percentile(latencies, 50)),
+            "p90": ms(percentile(latencies, 90)),
+            "p99": ms(percentile(latencies, 99)),
+            "max": ms(max(latencies) if latencies else None),
+        },
+        "cpu_s": round(cpu, 3),
+        "cpu_ms_per_audit": round(cpu * 1000 / len(urls), 3),
+        "mb_read": round(bytes_read / (1024 * 1024), 2),
+        "parse_ms_mean": ms(sum(parse_ms) / len(parse_ms)) if parse_ms else None,
+        "check_cpu_ms_mean": {rule_id: ms(sum(values) / len(values)) for rule_id, values in sorted(rule_ms.items())},
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def compare(current, baseline_path):
+    """
+    Print p50 / p99 / throughput changes against an earlier results file.
+    """
+    with open(baseline_path) as f:
+        baseline = {s["scenario"]: s for s in json.load(f)["scenarios"]}
+    print(f"\nvs {baseline_path}")
+    for scenario in current["scenarios"]:
+        old = baseline.get(scenario["scenario"])
+        if old is None:
+            continue
+        cells = []
+        for label, new_value, old_value in (
+                ("p50", scenario["latency_ms"]["p50"], old["latency_ms"]["p50"]),
+                ("p99", scenario["latency_ms"]["p99"], old["latency_ms"]["p99"]),
+                ("rps", scenario["throughput_rps"], old["throughput_rps"])):
+            if new_value is None or not old_value:
+                continue
+            cells.append(f"{label} {old_value} -> {new_value} ({(new_value - old_value) / old_value:+.1%})")
+        print(f"  {scenario['scenario']:<24} " + "  ".join(cells))
+
+
+async def main(args):
+    # All requests come from one client to one origin: measure the pipeline, not the API's limits
+    # (read when aeo_api is imported)
+    os.environ["AEO_RATE_LIMIT"] = "0"
+    os.environ["AEO_ORIGIN_CONCURRENCY"] = str(args.concurrency)
+    corpus = build_corpus(args.seed)
+    selected = [s for s in SCENARIOS if not args.only or s[0] in args.only]
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parser": os.environ.get("AEO_PARSER", "auto"),
+        "config": {key: getattr(args, key) for key in
+                   ("requests", "concurrency", "latency", "fail_rate", "drop_rate", "cold_origin", "seed")},
+        "scenarios": [],
+    }
+    for name, size, variant, entry in selected:
+        result = await run_scenario(name, size, variant, entry, corpus, args)
+        report["scenarios"].append(result)
+        print(f"⏱️ {name:<24} p50 {result['latency_ms']['p50']:>9.1f} ms  p99 {result['latency_ms']['p99']:>9.1f} ms  "
+              f"{result['throughput_rps']:>8.1f} req/s  {result['errors']} errors")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the AEO audit pipeline against a local fixture site.")
+    parser.add_argument("--requests", type=int, default=100, help="audits per scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the fixture server waits per response")
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--cold-origin", action="store_true", help="clear the robots/sitemap cache before every audit")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", nargs="*", help="scenario names to run")
+    parser.add_argument("--out", help="results file (default benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to diff against")
+    args = parser.parse_args()
+
+    report = asyncio.run(main(args))
+    out = args.out or os.path.join(RESULTS_DIR, f"{report['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"📝 Results written to {out}")
+    if args.compare:
+        compare(report, args.compare)
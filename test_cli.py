@@ -0,0 +1,131 @@
+"""
+Bulk CLI checkpoints (aeo.cli.bulk): an interrupted run is cut back to its last checkpoint
+and resumed from the next input row, so the output ends up with every row once, in order.
+The audit itself is replaced by a stand-in; this is about the bookkeeping around it.
+
+Run: python -m pytest test_cli.py
+"""
+import asyncio
+import io
+import json
+
+import pytest
+
+from aeo import cli
+
+URLS = [f"https://example.com/{i}" for i in range(40)]
+
+
+class Interrupted(BaseException):
+    # Like Ctrl-C: not an Exception, so the worker does not turn it into an error row
+    pass
+
+
+class FakeAudit:
+    """
+    Stands in for analyze_aeo_async: records the URLs it audited, raises Interrupted at `stop_at`.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.stop_at = None
+
+    async def __call__(self, url, client, use_cache=True, profile=None):
+        await asyncio.sleep(0)
+        if url == self.stop_at:
+            raise Interrupted()
+        self.calls.append(url)
+        return {"score": len(url), "url": url, "results": []}
+
+
+@pytest.fixture
+def audit(monkeypatch):
+    fake = FakeAudit()
+    monkeypatch.setattr(cli, "analyze_aeo_async", fake)
+    return fake
+
+
+def write_input(tmp_path, lines):
+    path = tmp_path / "urls.txt"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def run(input_path, out_path, **kwargs):
+    return asyncio.run(cli.bulk(input_path, out_path, concurrency=4, stats_stream=io.StringIO(), **kwargs))
+
+
+def rows(out_path):
+    with open(out_path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_rows_are_written_in_input_order(tmp_path, audit):
+    input_path = write_input(tmp_path, ["# header comment", URLS[0], "", URLS[1], "  ", URLS[2]])
+    out_path = str(tmp_path / "out.ndjson")
+    stats = run(input_path, out_path)
+    assert [(row["row"], row["url"]) for row in rows(out_path)] == [(0, URLS[0]), (1, URLS[1]), (2, URLS[2])]
+    assert stats.done == 3
+    with open(out_path + ".checkpoint", encoding="utf-8") as f:
+        assert json.load(f)["complete"]
+
+
+def test_interrupted_run_resumes_without_gaps_or_duplicates(tmp_path, audit):
+    input_path = write_input(tmp_path, URLS)
+    out_path = str(tmp_path / "out.ndjson")
+    audit.stop_at = URLS[25]
+    with pytest.raises(Interrupted):
+        run(input_path, out_path)
+    with open(out_path + ".checkpoint", encoding="utf-8") as f:
+        saved = json.load(f)
+    assert not saved["complete"]
+    # Rows after the failed one may be finished but are held back: output stops right before it
+    assert saved["next_index"] == 25
+    assert [row["row"] for row in rows(out_path)] == list(range(25))
+
+    # A crash between checkpoints leaves lines (and half a line) past the checkpoint,
+    # more of them than the resumed run writes, so overwriting alone would not hide them
+    with open(out_path, "ab") as f:
+        f.write(b'{"row": 25, "url": "stale"}\n' * 100 + b'{"row": 26, "ur')
+
+    audit.calls.clear()
+    audit.stop_at = None
+    stats = run(input_path, out_path)
+    assert [row["row"] for row in rows(out_path)] == list(range(len(URLS)))
+    assert [row["url"] for row in rows(out_path)] == URLS
+    # Only the rows after the checkpoint were audited again
+    assert sorted(audit.calls) == sorted(URLS[25:])
+    # Stats carry over from the checkpoint
+    assert stats.done == len(URLS)
+
+
+def test_resume_reads_a_csv_past_its_header(tmp_path, audit):
+    path = tmp_path / "urls.csv"
+    path.write_text("name,url\n" + "".join(f"page {i},{url}\n" for i, url in enumerate(URLS[:10])), encoding="utf-8")
+    out_path = str(tmp_path / "out.ndjson")
+    audit.stop_at = URLS[6]
+    with pytest.raises(Interrupted):
+        run(str(path), out_path)
+    audit.stop_at = None
+    run(str(path), out_path)
+    assert [row["url"] for row in rows(out_path)] == URLS[:10]
+
+
+def test_existing_output_without_checkpoint_is_not_overwritten(tmp_path, audit):
+    input_path = write_input(tmp_path, URLS[:3])
+    out_path = tmp_path / "out.ndjson"
+    out_path.write_text("precious\n", encoding="utf-8")
+    with pytest.raises(SystemExit):
+        run(input_path, str(out_path))
+    assert out_path.read_text(encoding="utf-8") == "precious\n"
+    run(input_path, str(out_path), fresh=True)
+    assert [row["url"] for row in rows(str(out_path))] == URLS[:3]
+
+
+def test_checkpoint_of_another_input_is_refused(tmp_path, audit):
+    out_path = str(tmp_path / "out.ndjson")
+    run(write_input(tmp_path, URLS[:3]), out_path)
+    other = tmp_path / "other.txt"
+    other.write_text(URLS[5] + "\n", encoding="utf-8")
+    with pytest.raises(SystemExit):
+        run(str(other), out_path)
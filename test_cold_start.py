@@ -0,0 +1,58 @@
+"""
+Cold-start budget for the Vercel function: importing api/index.py must not load the
+heavy dependencies (they load with the first audit) and must stay under a time budget.
+Each measurement runs in a fresh interpreter; FastAPI and pydantic are imported first,
+so only our own import cost is measured.
+
+Run: python -m pytest test_cold_start.py
+Override the budget with AEO_IMPORT_BUDGET_MS (e.g. on a slow CI runner).
+"""
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# api/index.py on top of FastAPI: ~75 ms here, ~330 ms before the package and its lazy imports
+IMPORT_BUDGET_MS = float(os.environ.get("AEO_IMPORT_BUDGET_MS", 200))
+RUNS = 3
+
+# Must not be loaded just by importing the app
+HEAVY = ("httpx", "httpcore", "lxml", "selectolax", "multiprocessing", "concurrent.futures", "playwright",
+         "bs4", "requests")
+
+PROBE = """
+import json, sys, time
+import fastapi, fastapi.middleware.cors, pydantic
+before = set(sys.modules)
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"ms": elapsed * 1000, "loaded": sorted(set(sys.modules) - before)}}))
+"""
+
+
+def measure(module):
+    output = subprocess.check_output([sys.executable, "-c", PROBE.format(module=module)], cwd=ROOT, text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def heavy_in(loaded):
+    return sorted(name for name in loaded if any(name == heavy or name.startswith(heavy + ".") for heavy in HEAVY))
+
+
+def test_package_import_loads_nothing():
+    loaded = measure("aeo")["loaded"]
+    assert [name for name in loaded if name.startswith("aeo.")] == []
+    assert heavy_in(loaded) == []
+
+
+def test_vercel_app_import_skips_heavy_dependencies():
+    assert heavy_in(measure("api.index")["loaded"]) == []
+
+
+def test_vercel_app_import_within_budget():
+    # Best of a few runs: the budget is about our imports, not a noisy machine
+    best = min(measure("api.index")["ms"] for _ in range(RUNS))
+    assert best < IMPORT_BUDGET_MS, f"importing api/index.py took {best:.0f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)"
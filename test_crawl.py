@@ -0,0 +1,61 @@
+"""
+Site crawl against a local HTTP server: a malformed sitemap <loc> is skipped and the
+crawl still finishes with its site summary (it used to hang the workers).
+
+Run: python -m pytest test_crawl.py
+"""
+import asyncio
+import functools
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from aeo.crawl import crawl_site
+from aeo.http import HttpPool
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "pages")
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site(tmp_path):
+    handler = functools.partial(QuietHandler, directory=str(tmp_path))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    with open(os.path.join(FIXTURES, "faq_page.html"), encoding="utf-8") as f:
+        page = f.read()
+    for name in ("index.html", "a.html", "b.html"):
+        (tmp_path / name).write_text(page, encoding="utf-8")
+    (tmp_path / "robots.txt").write_text(f"User-agent: *\nAllow: /\nSitemap: {base}/sitemap.xml\n")
+    (tmp_path / "sitemap.xml").write_text(
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+        f"<url><loc>{base}/a.html</loc></url>\n"
+        "<url><loc>http://[bad</loc></url>\n"
+        f"<url><loc>{base}/b.html</loc></url>\n"
+        "</urlset>\n")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield base
+    server.shutdown()
+    server.server_close()
+
+
+def test_bad_sitemap_loc_is_skipped(site):
+    async def crawl():
+        events = []
+        async with HttpPool() as client:
+            async for event in crawl_site(site + "/index.html", concurrency=2, client=client):
+                events.append(event)
+        return events
+
+    events = asyncio.run(asyncio.wait_for(crawl(), 30))
+    pages = sorted(event["url"] for event in events if event["type"] == "page")
+    assert pages == [site + "/a.html", site + "/b.html", site + "/index.html"]
+    assert events[-1]["type"] == "site"
@@ -0,0 +1,73 @@
+"""
+Link classification (aeo.links): hosts compare by registrable domain, so www. and
+subdomains are internal and look-alike hosts are not; non-navigable hrefs are skipped.
+
+Run: python -m pytest test_links.py
+"""
+import pytest
+
+from aeo.links import BROKEN, EXTERNAL, INTERNAL, SKIPPED, LinkClassifier, classify_links, registrable_domain
+
+PAGE = "https://www.example.com/blog/post"
+
+
+@pytest.mark.parametrize("href", [
+    "https://example.com/",
+    "https://www.example.com/about",
+    "http://shop.example.com/cart",
+    "//cdn.example.com/app.js",
+    "HTTPS://EXAMPLE.COM/Upper",
+    "https://user@example.com:8443/login",
+    "/pricing",
+    "faq",
+    "../index.html",
+    "?page=2",
+    "path/with:colon",
+])
+def test_same_site_links_are_internal(href):
+    assert LinkClassifier(PAGE).classify(href) == INTERNAL
+
+
+@pytest.mark.parametrize("href", [
+    "https://example.com.evil.io/",
+    "https://evil.io/?next=https://example.com/",
+    "https://notexample.com/",
+    "//example.org/",
+    "https://example.com@evil.io/",
+    "ftp://example.com/file",
+])
+def test_other_sites_are_external(href):
+    assert LinkClassifier(PAGE).classify(href) == EXTERNAL
+
+
+@pytest.mark.parametrize("href", ["#", "#section", "javascript:void(0)", "JavaScript:go()", "mailto:hi@example.com",
+                                  "tel:+821012345678", "", "   "])
+def test_non_navigable_links_are_skipped(href):
+    assert LinkClassifier(PAGE).classify(href) == SKIPPED
+
+
+@pytest.mark.parametrize("href", [None, "http:/path", "https:example.com", "https://[bad/", "https://exa mple.com/"])
+def test_malformed_links_are_broken(href):
+    assert LinkClassifier(PAGE).classify(href) == BROKEN
+
+
+def test_multi_label_public_suffix():
+    assert registrable_domain("shop.example.co.kr") == "example.co.kr"
+    classify = LinkClassifier("https://www.example.co.kr/").classify
+    assert classify("https://news.example.co.kr/") == INTERNAL
+    # Another site under the same public suffix is not the same site
+    assert classify("https://other.co.kr/") == EXTERNAL
+    assert LinkClassifier("https://me.github.io/").classify("https://you.github.io/") == EXTERNAL
+
+
+def test_ip_and_localhost_pages():
+    classify = LinkClassifier("http://127.0.0.1:8000/").classify
+    assert classify("http://127.0.0.1:9000/x") == INTERNAL
+    # IPs are not split into labels: 10.0.0.1 and 127.0.0.1 do not share a "0.1" domain
+    assert classify("http://10.0.0.1/") == EXTERNAL
+    assert LinkClassifier("http://localhost/").classify("http://localhost:3000/") == INTERNAL
+
+
+def test_classify_links_counts():
+    hrefs = ["/a", "https://blog.example.com/", "https://example.com.evil.io/", "#top", "javascript:;", None]
+    assert classify_links(PAGE, hrefs) == {INTERNAL: 2, EXTERNAL: 1, SKIPPED: 2, BROKEN: 1}
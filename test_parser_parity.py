@@ -0,0 +1,104 @@
+"""
+Parser parity suite: every HTML backend in aeo.parsers must give the same Pass/Fail
+for all ten checks on the saved pages in fixtures/pages (reference: expected.json).
+Backends that are not installed are skipped.
+
+Run: python -m pytest test_parser_parity.py
+"""
+import json
+import os
+
+import pytest
+
+from aeo.parsers import BACKENDS, available_backends, resolve_backend
+from aeo.profiles import compile_profile
+from aeo.rules import AuditContext, RuleEngine
+from aeo.text import SAMPLE_CHARS
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "pages")
+
+with open(os.path.join(FIXTURES, "expected.json"), encoding="utf-8") as f:
+    EXPECTED = json.load(f)
+
+
+def run_engine(html, backend, chunk_size=None):
+    ctx = AuditContext("https://example.com/page", "https://example.com")
+    # Checks 9-10 do not depend on the parser; pin them
+    ctx.robots_status = 200
+    ctx.sitemap_status = 404
+    engine = RuleEngine(ctx, backend=backend)
+    assert engine.parser.name == backend
+    step = chunk_size or len(html)
+    for i in range(0, len(html), step):
+        engine.feed(html[i:i + step])
+    engine.close()
+    return engine
+
+
+def run_checks(page, backend, chunk_size=None):
+    with open(os.path.join(FIXTURES, page), encoding="utf-8") as f:
+        engine = run_engine(f.read(), backend, chunk_size)
+    _, results, _ = engine.results()
+    return {rule.id: result["status"] for rule, result in zip(engine.rules, results)}
+
+
+def require(backend):
+    if backend not in available_backends():
+        pytest.skip(f"{backend} is not installed")
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+@pytest.mark.parametrize("page", sorted(EXPECTED))
+def test_backend_matches_expected(page, backend):
+    require(backend)
+    assert run_checks(page, backend) == EXPECTED[page]
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+@pytest.mark.parametrize("page", sorted(EXPECTED))
+def test_chunked_feed_matches_whole_document(page, backend):
+    # Network chunks can split tags and text anywhere
+    require(backend)
+    assert run_checks(page, backend, chunk_size=97) == EXPECTED[page]
+
+
+def content_volume(engine):
+    engine.settle_html()
+    return next(rule for rule in engine.rules if rule.id == "content_volume")
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_content_volume_details_do_not_depend_on_chunks(backend):
+    # A long page is read up to the text sample only; the sample ends at the same place however it was split
+    require(backend)
+    with open(os.path.join(FIXTURES, "blog_article.html"), encoding="utf-8") as f:
+        html = f.read()
+    long_page = html.replace("</body>", "<p>Plain words, then a sentence end. Another one?</p>" * 500 + "</body>")
+    for page in (html, long_page):
+        details = [content_volume(run_engine(page, backend, step)).details for step in (None, 97, 13)]
+        assert details[0] is not None
+        assert details[0] == details[1] == details[2]
+    assert details[0]["sampled"] and details[0]["chars"] == SAMPLE_CHARS
+
+
+@pytest.mark.parametrize("min_chars, status", [(500, "Pass"), (5200, "Pass"), (5500, "Fail"), (20000, "Fail")])
+def test_content_volume_threshold_above_the_sample(min_chars, status):
+    # ~5250 visible characters: a profile's min_chars still decides past SAMPLE_CHARS
+    plan = compile_profile("test", {"thresholds": {"content_volume": {"min_chars": min_chars}}})
+    ctx = AuditContext("https://example.com/page", "https://example.com")
+    engine = RuleEngine(ctx, rules=plan.rules, backend="html.parser")
+    engine.feed("<html><body><p>" + "word " * 1050 + "</p></body></html>")
+    engine.close()
+    assert content_volume(engine).outcome[0] == status
+
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_empty_cdata_after_a_sentence_end(backend):
+    require(backend)
+    engine = run_engine("<html><body><p>End.<![CDATA[]]></p><p>Next one.</p></body></html>", backend)
+    assert content_volume(engine).details["sentences"] == 2
+
+
+def test_fallback_to_html_parser():
+    assert resolve_backend("no-such-parser") == "html.parser"
+    assert resolve_backend("auto") == available_backends()[0]
@@ -0,0 +1,115 @@
+"""
+Render stage: the shell probe flags client-rendered pages (and only those), the render pool
+keeps its renderers warm and drops one that failed, and a bad AEO_RENDERER fails at startup.
+
+Run: python -m pytest test_render.py
+"""
+import asyncio
+import os
+
+import pytest
+
+from aeo import render
+from aeo.render import RendererError, RenderPool, ShellProbe, StubRenderer, check_renderer
+from aeo.rules import AuditContext, RuleEngine
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "pages")
+
+
+def probe_page(page, chunk_size=None):
+    with open(os.path.join(FIXTURES, page), encoding="utf-8") as f:
+        html = f.read()
+    probe = ShellProbe()
+    engine = RuleEngine(AuditContext("https://example.com/app", "https://example.com"), observer=probe)
+    step = chunk_size or len(html)
+    for i in range(0, len(html), step):
+        engine.feed(html[i:i + step])
+    engine.close()
+    return probe.verdict()
+
+
+@pytest.mark.parametrize("chunk_size", [None, 97])
+def test_spa_shell_is_flagged(chunk_size):
+    verdict = probe_page("spa_shell.html", chunk_size)
+    assert verdict["shell"]
+    assert verdict["reasons"]
+    assert verdict == probe_page("spa_shell.html")
+
+
+@pytest.mark.parametrize("page", ["faq_page.html", "blog_article.html", "korean_news.html"])
+def test_content_page_is_not_a_shell(page):
+    assert not probe_page(page)["shell"]
+
+
+def test_pool_reuses_a_warm_renderer():
+    async def run():
+        pool = RenderPool(lambda: StubRenderer(pages={"https://example.com/": "<p>hi</p>"}), size=2)
+        for _ in range(3):
+            assert await pool.render("https://example.com/") == "<p>hi</p>"
+        created = pool.created
+        await pool.close()
+        return created
+
+    assert asyncio.run(run()) == 1
+
+
+def test_pool_drops_a_failed_renderer():
+    async def run():
+        renderers = []
+
+        def factory():
+            renderers.append(StubRenderer(pages={"https://example.com/ok": "<p>ok</p>"}))
+            return renderers[-1]
+
+        pool = RenderPool(factory, size=1)
+        with pytest.raises(LookupError):
+            await pool.render("https://example.com/missing")
+        assert await pool.render("https://example.com/ok") == "<p>ok</p>"
+        created = pool.created
+        await pool.close()
+        return created, [renderer.renders for renderer in renderers]
+
+    created, renders = asyncio.run(run())
+    # The failed renderer was thrown away, the next page got a fresh one
+    assert created == 2
+    assert renders == [1, 1]
+
+
+def test_pool_closes_a_cancelled_renderer():
+    class Tracked(StubRenderer):
+        closed = False
+
+        async def close(self):
+            self.closed = True
+
+    async def run():
+        renderers = []
+
+        def factory():
+            renderers.append(Tracked(pages={"https://example.com/": "<p>hi</p>"}, delay=0.2))
+            return renderers[-1]
+
+        pool = RenderPool(factory, size=1)
+        task = asyncio.ensure_future(pool.render("https://example.com/"))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert await pool.render("https://example.com/") == "<p>hi</p>"
+        assert await pool.render("https://example.com/") == "<p>hi</p>"
+        closed = [renderer.closed for renderer in renderers]
+        await pool.close()
+        return pool.created, closed
+
+    created, closed = asyncio.run(run())
+    # The cancelled renderer was closed right away, not left running; one fresh instance served the rest
+    assert created == 2
+    assert closed == [True, False]
+
+
+def test_unknown_renderer_fails_the_startup_check(monkeypatch):
+    monkeypatch.setattr(render, "RENDERER", "chromium")
+    with pytest.raises(RendererError):
+        check_renderer()
+    monkeypatch.setattr(render, "RENDERER", "stub")
+    check_renderer()
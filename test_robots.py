@@ -0,0 +1,96 @@
+"""
+robots.txt matching (aeo.robots.RobotsPolicy): which user-agent group applies, and which
+rule wins inside it (longest pattern, Allow on a tie, `*` and `$`).
+
+Run: python -m pytest test_robots.py
+"""
+import pytest
+
+from aeo.robots import RobotsPolicy
+
+PAGE = "https://example.com/page"
+
+
+def test_empty_user_agent_does_not_override_the_star_group():
+    policy = RobotsPolicy.parse("User-agent:\nDisallow:\n\nUser-agent: *\nDisallow: /\n")
+    assert not policy.can_fetch("*", PAGE)
+
+
+def test_product_token_matches_exactly():
+    policy = RobotsPolicy.parse("User-agent: googlebot\nAllow: /\n\nUser-agent: *\nDisallow: /\n")
+    assert policy.can_fetch("Googlebot/2.1", PAGE)
+    # Neither a longer token nor a substring of one picks the googlebot group
+    assert not policy.can_fetch("Googlebot-Image", PAGE)
+    assert not policy.can_fetch("bot", PAGE)
+
+
+def allowed(rules, path):
+    policy = RobotsPolicy.parse("User-agent: *\n" + rules)
+    return policy.can_fetch("aeo-check", "https://example.com" + path)
+
+
+@pytest.mark.parametrize("rules", [
+    "Disallow: /shop\nAllow: /shop/public\n",
+    "Allow: /shop/public\nDisallow: /shop\n",
+])
+def test_longest_match_wins_whatever_the_order(rules):
+    assert allowed(rules, "/shop/public/item")
+    assert not allowed(rules, "/shop/cart")
+    assert allowed(rules, "/blog")
+
+
+@pytest.mark.parametrize("rules", [
+    "Allow: /page\nDisallow: /page\n",
+    "Disallow: /page\nAllow: /page\n",
+    "Disallow: /pa*e\nAllow: /pag*\n",
+])
+def test_allow_wins_a_tie(rules):
+    assert allowed(rules, "/page")
+
+
+def test_a_shorter_allow_loses_to_a_longer_disallow():
+    assert not allowed("Allow: /\nDisallow: /private\n", "/private/x")
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("/search?q=aeo", False),
+    ("/products/search", False),
+    ("/searching", False),
+    ("/help", True),
+])
+def test_star_matches_any_run(path, expected):
+    assert allowed("Disallow: /*search\n", path) == expected
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("/report.pdf", False),
+    ("/files/report.pdf", False),
+    ("/report.pdf?download=1", True),
+    ("/report.pdfx", True),
+])
+def test_dollar_anchors_the_end(path, expected):
+    assert allowed("Disallow: /*.pdf$\n", path) == expected
+
+
+def test_dollar_on_its_own_is_an_exact_path():
+    assert not allowed("Disallow: /$\n", "/")
+    assert allowed("Disallow: /$\n", "/page")
+
+
+def test_query_is_part_of_the_path():
+    assert not allowed("Disallow: /*?sort=\n", "/list?sort=price")
+    assert allowed("Disallow: /*?sort=\n", "/list")
+
+
+def test_pattern_metacharacters_are_literal():
+    assert not allowed("Disallow: /a.b+(c)\n", "/a.b+(c)/x")
+    assert allowed("Disallow: /a.b+(c)\n", "/aXb+(c)")
+
+
+def test_robots_txt_itself_is_always_allowed():
+    assert allowed("Disallow: /\n", "/robots.txt")
+    assert not allowed("Disallow: /\n", "/")
+
+
+def test_empty_disallow_allows_everything():
+    assert allowed("Disallow:\n", "/anything")